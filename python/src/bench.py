@@ -0,0 +1,361 @@
+"""
+Python Advent of Code - bench.py
+
+Benchmarks for the daily puzzle solutions.
+
+Each requested part of each puzzle is solved a number of times after some
+warmup runs, and the minimum, median, and 95th percentile run times are
+reported along with the peak memory allocated during a separate traced run.
+The measurements can be saved as a baseline, and later runs fail when a
+puzzle has become slower than the baseline by more than a threshold.
+"""
+
+import argparse
+import importlib
+import json
+import math
+import pathlib
+import statistics
+import time
+import tracemalloc
+
+import runner
+
+DEFAULT_BASELINE = pathlib.Path(
+    f"{runner.BASE_DIR}/python/bench_baseline.json"
+)
+
+
+class Measurement:
+    """
+    A class representing the benchmark results of one part of one puzzle
+    """
+
+    def __init__(
+        self,
+        year: int,
+        day: int,
+        part: int,
+        times: list[float],
+        peak: int,
+        size: int | None = None,
+    ) -> None:
+        self.year = year
+        self.day = day
+        self.part = part
+        self.times = sorted(times)
+        self.peak = peak
+        self.size = size
+
+    @property
+    def key(self) -> str:
+        """
+        The name of the measurement within a baseline file
+        """
+
+        key = f"{self.year}-{self.day:02d}-{self.part}"
+        if self.size is not None:
+            key = f"{key}@{self.size}"
+        return key
+
+    @property
+    def minimum(self) -> float:
+        """
+        The fastest run time, in seconds
+        """
+
+        return self.times[0]
+
+    @property
+    def median(self) -> float:
+        """
+        The median run time, in seconds
+        """
+
+        return statistics.median(self.times)
+
+    @property
+    def p95(self) -> float:
+        """
+        The 95th percentile run time, in seconds
+        """
+
+        # Nearest-rank percentile, so it is always an observed time
+        rank = math.ceil(0.95 * len(self.times))
+        return self.times[rank - 1]
+
+    def to_dict(self) -> dict:
+        """
+        Convert the measurement into a JSON serializable dict
+
+        :returns: The summary statistics of the measurement
+        """
+
+        return {
+            "min": self.minimum,
+            "median": self.median,
+            "p95": self.p95,
+            "peak_memory": self.peak,
+            "repeat": len(self.times),
+        }
+
+
+def measure(
+    year: int,
+    day: int,
+    part: int,
+    repeat: int,
+    warmup: int,
+    puzzle: list[str] | None = None,
+    size: int | None = None,
+    workers: int = 1,
+) -> Measurement:
+    """
+    Benchmark one part of one puzzle
+
+    :param year: The year of the puzzle
+    :param day: The day of the puzzle
+    :param part: The part of the puzzle to solve
+    :param repeat: The number of timed runs
+    :param warmup: The number of untimed runs before the timed runs
+    :param puzzle:
+        The puzzle input to solve.
+        If None, the real puzzle input for the day is used.
+    :param size: The size of the generated puzzle input, if one is used
+    :param workers:
+        The number of worker processes to pass to the solution,
+        if it sets PARALLEL = True
+    :returns: The Measurement of the part
+    """
+
+    if repeat < 1:
+        raise ValueError(f"The repeat count must be positive, not {repeat}.")
+
+    if puzzle is None:
+        puzzle = runner.load_puzzle(year, day)
+    module = importlib.import_module(f"{runner.YEARS[year]}.day_{day:02d}")
+    options = {"part": part}
+    if getattr(module, "PARALLEL", False):
+        options["workers"] = workers
+
+    for _ in range(warmup):
+        module.solve(puzzle, **options)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        module.solve(puzzle, **options)
+        times.append(time.perf_counter() - start)
+
+    # Tracing slows everything down, so memory gets its own untimed run
+    tracemalloc.start()
+    try:
+        module.solve(puzzle, **options)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(year, day, part, times, peak, size=size)
+
+
+def hash_rate(count: int) -> dict[str, float]:
+    """
+    Measure how quickly the 2015 Day 4 solution checks integers,
+    with and without reusing the MD5 state of the common prefix
+
+    :param count: The number of integers to hash with each method
+    :returns: The hashes per second of each method
+    """
+
+    day_04 = importlib.import_module("twentyfifteen.day_04")
+    start = 1000
+    stop = start + -(-count // 1000) * 1000
+
+    rates = dict()
+    for name, prefix in {"simple": False, "prefix": True}.items():
+        begin = time.perf_counter()
+        # No hash has 32 leading zeros, so every integer is checked
+        day_04.scan("abcdef", start, stop, (32,), prefix=prefix)
+        rates[name] = (stop - start) / (time.perf_counter() - begin)
+
+    return rates
+
+
+def compare(
+    measurements: list[Measurement], baseline: dict, threshold: float
+) -> list[str]:
+    """
+    Find the measurements that are slower than their baseline
+
+    :param measurements: The new measurements
+    :param baseline: The baseline measurements, keyed by Measurement.key
+    :param threshold:
+        The allowed fractional slowdown of the median time,
+        e.g. 0.2 allows a median up to 20% slower than the baseline
+    :returns: A description of each regression found
+    """
+
+    regressions = []
+    for measurement in measurements:
+        if measurement.key not in baseline:
+            continue
+        reference = baseline[measurement.key]["median"]
+        if measurement.median > reference * (1 + threshold):
+            regressions.append(
+                f"{measurement.key}: median {measurement.median:.6f} s "
+                f"is more than {threshold:.0%} slower than "
+                f"the baseline of {reference:.6f} s"
+            )
+
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    """
+    Entry point for benchmarking the daily puzzle solutions
+
+    :param argv: The command line arguments following "bench"
+    :returns: 0 if no regressions were found, otherwise 1
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="main.py bench",
+        description="Benchmarks Advent of Code programs on puzzle inputs",
+        epilog="Example Usage: python main.py bench 2015:1-3 --repeat 10",
+    )
+    parser.add_argument(
+        "puzzles",
+        nargs="?",
+        default="all",
+        help="the puzzles to benchmark, e.g. all, 2015, or 2023:1-6",
+    )
+    parser.add_argument(
+        "--part",
+        type=int,
+        choices=[1, 2],
+        default=None,
+        help="the part to benchmark. If omitted, both parts are benchmarked",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="the number of timed runs"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="the number of untimed runs before the timed runs",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        default=DEFAULT_BASELINE,
+        help=f"the baseline file to use (default: {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="save the measurements to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help=(
+            "the allowed fractional slowdown of the median time "
+            "relative to the baseline (default: 0.2)"
+        ),
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=None,
+        help=(
+            "benchmark on generated inputs of this size "
+            "instead of the real puzzle inputs"
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="the seed for generated inputs (default: 0)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "the number of processes used by the solutions that support "
+            "them (default: 1)"
+        ),
+    )
+
+    parser.add_argument(
+        "--hash-rate",
+        type=int,
+        default=None,
+        metavar="COUNT",
+        help=(
+            "instead of benchmarking puzzles, report the hashes per second "
+            "of the 2015 Day 4 MD5 search over COUNT integers"
+        ),
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.hash_rate is not None:
+        rates = hash_rate(args.hash_rate)
+        for name, rate in rates.items():
+            print(f"{name:<8} {rate:>14,.0f} hashes/s")
+        print(f"speedup  {rates['prefix'] / rates['simple']:>14.2f}x")
+        return 0
+
+    parts = [1, 2] if args.part is None else [args.part]
+    measurements = []
+    print(
+        f"{'puzzle':<18} {'min (s)':>12} {'median (s)':>12} "
+        f"{'p95 (s)':>12} {'peak (KiB)':>12}"
+    )
+    for year, day in runner.parse_spec(args.puzzles):
+        puzzle = None
+        if args.size is not None:
+            chunks = runner.generate_puzzle(
+                year, day, args.size, seed=args.seed
+            )
+            puzzle = "".join(chunks).splitlines()
+        for part in parts:
+            measurement = measure(
+                year,
+                day,
+                part,
+                args.repeat,
+                args.warmup,
+                puzzle=puzzle,
+                size=args.size,
+                workers=args.workers,
+            )
+            measurements.append(measurement)
+            print(
+                f"{measurement.key:<18} {measurement.minimum:>12.6f} "
+                f"{measurement.median:>12.6f} {measurement.p95:>12.6f} "
+                f"{measurement.peak / 1024:>12.1f}"
+            )
+
+    baseline = dict()
+    if args.baseline.exists():
+        with open(args.baseline, "r") as data:
+            baseline = json.load(data)
+
+    if args.save:
+        for measurement in measurements:
+            baseline[measurement.key] = measurement.to_dict()
+        with open(args.baseline, "w") as data:
+            json.dump(baseline, data, indent=2, sort_keys=True)
+        print(f"Saved the baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(measurements, baseline, args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+
+    return 1 if regressions else 0
@@ -3,10 +3,14 @@ Python Advent of Code - main.py
 """
 
 import argparse
-import importlib
+import json
 import pathlib
 import sys
 
+import bench
+import runner
+from solution import Result
+
 
 def _error(arg: str, example: str, value: str) -> str:
     """
@@ -24,19 +28,151 @@ def _error(arg: str, example: str, value: str) -> str:
     )
 
 
+def _print_results(
+    solved: list[tuple[int, int, list[Result], str | None]],
+    output_format: str,
+    headers: bool,
+) -> None:
+    """
+    Print the answers to the solved puzzles
+
+    :param solved:
+        A list of (year, day, results, error) tuples, where error describes
+        why the puzzle could not be solved, or is None
+    :param output_format: One of "text", "json", or "ndjson"
+    :param headers: If True, label the text output of each puzzle
+    """
+
+    records = []
+    for year, day, results, error in solved:
+        if error is not None:
+            records.append({"year": year, "day": day, "error": error})
+        for result in results:
+            records.append({"year": year, "day": day, **result.to_dict()})
+
+    match output_format:
+        case "text":
+            for year, day, results, error in solved:
+                if headers:
+                    print(f"Year {year}, Day {day}")
+                if error is not None:
+                    print(f"Failed with {error}")
+                for result in results:
+                    print(result.message)
+        case "json":
+            print(json.dumps(records, indent=2))
+        case "ndjson":
+            for record in records:
+                print(json.dumps(record))
+        case _:
+            raise ValueError(
+                f"The output format must be one of "
+                f"'text', 'json', or 'ndjson', not '{output_format}'."
+            )
+
+
+def _generate(argv: list[str]) -> int:
+    """
+    Entry point for generating synthetic puzzle inputs
+
+    :param argv: The command line arguments following "generate"
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="main.py generate",
+        description="Generates large synthetic Advent of Code puzzle inputs",
+        epilog=(
+            "Example Usage: "
+            "python main.py generate 2015 1 --size 10000000 -o day_01.txt"
+        ),
+    )
+    parser.add_argument("year", type=int, help="the year of the puzzle")
+    parser.add_argument("day", type=int, help="the day of the puzzle")
+    parser.add_argument(
+        "--size",
+        type=int,
+        required=True,
+        help=(
+            "the size of the input, e.g. the number of characters, lines, "
+            "or rows, depending on the puzzle"
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="the seed for the random number generator (default: 0)",
+    )
+    parser.add_argument(
+        "--grid",
+        type=int,
+        default=None,
+        help=(
+            "the width and height of the grid of lights, "
+            "for 2015 Day 6 only (default: 1000)"
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="the file to write the input to. If omitted, print the input",
+    )
+
+    args = parser.parse_args(argv)
+
+    options = dict()
+    if args.grid is not None:
+        if (args.year, args.day) != (2015, 6):
+            parser.error("--grid is only supported for 2015 Day 6")
+        options["grid"] = args.grid
+    chunks = runner.generate_puzzle(
+        args.year, args.day, args.size, seed=args.seed, **options
+    )
+    if args.output is None:
+        sys.stdout.writelines(chunks)
+    else:
+        with open(args.output, "w") as data:
+            data.writelines(chunks)
+
+    return 0
+
+
 def main():
     """
     Entry point for running code on daily puzzle inputs
     """
-    # This is the base Advent of Code directory, not just the python directory
-    base_dir = pathlib.Path(f"{__file__}").parents[2].resolve()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        return bench.main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "generate":
+        return _generate(sys.argv[2:])
 
     parser = argparse.ArgumentParser(
         description="Runs Advent of Code programs to solve puzzle inputs",
-        epilog="Example Usage: python main.py 2015 1",
+        epilog=(
+            "Example Usage: python main.py 2015 1, python main.py 2015, "
+            "or python main.py 2023:1-6. "
+            "Run python main.py bench --help for benchmarking options, "
+            "or python main.py generate --help for generating inputs"
+        ),
+    )
+    parser.add_argument(
+        "year",
+        help=(
+            "the year of the puzzle to solve, or a batch of puzzles "
+            "to solve, e.g. all, 2015, or 2023:1-6"
+        ),
+    )
+    parser.add_argument(
+        "day",
+        nargs="?",
+        default=None,
+        help=(
+            "the day of the puzzle to solve. "
+            "If omitted, every day of the year will be solved"
+        ),
     )
-    parser.add_argument("year", help="the year of the puzzle to solve")
-    parser.add_argument("day", help="the day of the puzzle to solve")
     parser.add_argument(
         "part",
         nargs="?",
@@ -46,12 +182,75 @@ def main():
             "If omitted, both parts will be solved"
         ),
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "the number of processes to use. A batch of puzzles is spread "
+            "across this many processes, one puzzle each, and defaults to "
+            "one process per processor. A single day is solved with this "
+            "many processes by the solutions that support it, "
+            "and defaults to one"
+        ),
+    )
+    parser.add_argument(
+        "--input",
+        type=pathlib.Path,
+        default=None,
+        help=(
+            "the puzzle input file to solve, e.g. a generated input. "
+            "If omitted, the puzzle input in the data directory will be used"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "pass the puzzle input one line at a time to the solutions "
+            "that support it, instead of reading the whole file first"
+        ),
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help=(
+            "pass a memory map of the raw bytes of the puzzle input "
+            "to the solutions that support it, instead of decoding it first"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "ndjson"],
+        default="text",
+        help=(
+            "how to print the answers: as text, as a JSON list, "
+            "or as newline delimited JSON with one answer per line"
+        ),
+    )
 
     args = parser.parse_args()
     year = args.year
     day = args.day
     part = args.part
 
+    # Without a specific day, solve a batch of puzzles
+    if day is None:
+        if args.input is not None:
+            parser.error("--input can only be used to solve a single day")
+        days = runner.parse_spec(year)
+        solved = runner.run_batch(
+            days,
+            workers=args.workers,
+            stream=args.stream,
+            memory_map=args.mmap,
+        )
+        _print_results(solved, args.format, headers=True)
+        # Every puzzle is reported, but any failure fails the whole batch
+        if any(error is not None for _, _, _, error in solved):
+            return 1
+        return 0
+
     if not year.isdecimal():
         _error(arg="year", example="2015", value=year)
     year = int(year)
@@ -65,38 +264,18 @@ def main():
             _error(arg="part", example="1", value=part)
         part = int(part)
 
-    YEARS = {
-        2015: "twentyfifteen",
-        2023: "twentytwentythree",
-        2024: "twentytwentyfour",
-    }
-
-    if year not in YEARS:
-        raise ValueError(f"Advent of Code {year} is not currently supported")
-    year_module = YEARS[year]
-
-    day_module = f"day_{day:02d}"
-    module_path = pathlib.Path(
-        f"{base_dir}/python/src/{year_module}/{day_module}.py"
+    results = runner.run_day(
+        year,
+        day,
+        part=part,
+        stream=args.stream,
+        path=args.input,
+        memory_map=args.mmap,
+        workers=args.workers or 1,
     )
-    if not module_path.exists():
-        raise ValueError(
-            f"The code for year {year} and day {day} does not exist."
-        )
-
-    puzzle_input = pathlib.Path(
-        f"{base_dir}/data/{year_module}/{day_module}.txt"
+    _print_results(
+        [(year, day, results, None)], args.format, headers=False
     )
-    if not puzzle_input.exists():
-        raise ValueError(
-            f"Could not find puzzle input for year {year}, day {day}"
-        )
-
-    with open(puzzle_input, "r") as data:
-        puzzle = data.read().splitlines()
-
-    module = importlib.import_module(f"{year_module}.{day_module}")
-    module.solve(puzzle, part=part)
 
     return 0
 
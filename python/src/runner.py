@@ -0,0 +1,301 @@
+"""
+Python Advent of Code - runner.py
+
+Helpers for locating, loading, and running the daily puzzle solutions,
+either one at a time or in batches across a pool of processes.
+"""
+
+import concurrent.futures
+import importlib
+import mmap
+import pathlib
+import traceback
+from collections.abc import Iterator
+
+from solution import Result
+
+# This is the base Advent of Code directory, not just the python directory
+BASE_DIR = pathlib.Path(f"{__file__}").parents[2].resolve()
+
+YEARS = {
+    2015: "twentyfifteen",
+    2023: "twentytwentythree",
+    2024: "twentytwentyfour",
+}
+
+
+def find_days(year: int) -> list[int]:
+    """
+    Find all of the days that have a solution module for the input year
+
+    :param year: The year of the puzzles
+    :returns: The sorted list of days with a day_NN.py module
+    """
+
+    if year not in YEARS:
+        raise ValueError(f"Advent of Code {year} is not currently supported")
+
+    module_dir = pathlib.Path(f"{BASE_DIR}/python/src/{YEARS[year]}")
+    return sorted(
+        int(path.stem.split("_")[1])
+        for path in module_dir.glob("day_[0-9][0-9].py")
+    )
+
+
+def parse_spec(spec: str) -> list[tuple[int, int]]:
+    """
+    Expand a batch specification into the (year, day) pairs it covers.
+
+    Supported forms are:
+     * all: every day of every supported year
+     * 2015: every day of a single year
+     * 2023:3: a single day of a single year
+     * 2023:1-6: a range of days of a single year, inclusive
+     * 2015:1,3,5-7: a comma separated list of days and ranges
+
+    :param spec: The batch specification
+    :returns: The sorted list of (year, day) pairs
+    """
+
+    if spec == "all":
+        return [(year, day) for year in YEARS for day in find_days(year)]
+
+    year, _, days = spec.partition(":")
+    if not year.isdecimal():
+        raise ValueError(
+            f"The year of a batch must be a decimal integer, "
+            f"e.g. 2015 or 2015:1-7, not {spec}."
+        )
+    year = int(year)
+    available = find_days(year)
+    if not days:
+        return [(year, day) for day in available]
+
+    selected = set()
+    for group in days.split(","):
+        start, _, stop = group.partition("-")
+        if not start.isdecimal() or not (stop.isdecimal() or stop == ""):
+            raise ValueError(
+                f"The days of a batch must be decimal integers or ranges, "
+                f"e.g. 2015:1 or 2015:1-7, not {spec}."
+            )
+        stop = stop if stop else start
+        selected.update(range(int(start), int(stop) + 1))
+
+    missing = selected.difference(available)
+    if missing:
+        raise ValueError(
+            f"The code for year {year} and days {sorted(missing)} "
+            f"does not exist."
+        )
+
+    return [(year, day) for day in sorted(selected)]
+
+
+def _puzzle_path(year: int, day: int) -> pathlib.Path:
+    """
+    Find the puzzle input for the input year and day
+
+    :param year: The year of the puzzle
+    :param day: The day of the puzzle
+    :returns: The path to the puzzle input
+    """
+
+    if year not in YEARS:
+        raise ValueError(f"Advent of Code {year} is not currently supported")
+    year_module = YEARS[year]
+
+    day_module = f"day_{day:02d}"
+    module_path = pathlib.Path(
+        f"{BASE_DIR}/python/src/{year_module}/{day_module}.py"
+    )
+    if not module_path.exists():
+        raise ValueError(
+            f"The code for year {year} and day {day} does not exist."
+        )
+
+    puzzle_input = pathlib.Path(
+        f"{BASE_DIR}/data/{year_module}/{day_module}.txt"
+    )
+    if not puzzle_input.exists():
+        raise ValueError(
+            f"Could not find puzzle input for year {year}, day {day}"
+        )
+
+    return puzzle_input
+
+
+def load_puzzle(year: int, day: int) -> list[str]:
+    """
+    Read the puzzle input for the input year and day
+
+    :param year: The year of the puzzle
+    :param day: The day of the puzzle
+    :returns: The lines of the puzzle input
+    """
+
+    with open(_puzzle_path(year, day), "r") as data:
+        puzzle = data.read().splitlines()
+
+    return puzzle
+
+
+def read_lines(path: pathlib.Path) -> Iterator[str]:
+    """
+    Read a file one line at a time, without the line endings
+
+    :param path: The file to read
+    :returns: An iterator over the lines of the file
+    """
+
+    with open(path, "r") as data:
+        for line in data:
+            yield line.rstrip("\n")
+
+
+def generate_puzzle(
+    year: int, day: int, size: int, seed: int = 0, **options
+) -> Iterator[str]:
+    """
+    Generate a synthetic puzzle input for the input year and day
+
+    :param year: The year of the puzzle
+    :param day: The day of the puzzle
+    :param size: The size of the input, as defined by the day's generator
+    :param seed: The seed for the random number generator
+    :param options:
+        Any other keyword arguments of the day's generator,
+        e.g. grid for 2015 Day 6
+    :returns: An iterator over chunks of the text of the puzzle input
+    """
+
+    if year not in YEARS:
+        raise ValueError(f"Advent of Code {year} is not currently supported")
+
+    generators = importlib.import_module(f"{YEARS[year]}.generate").GENERATORS
+    if day not in generators:
+        raise ValueError(
+            f"There is no input generator for year {year} and day {day}."
+        )
+
+    return generators[day](size, seed=seed, **options)
+
+
+def run_day(
+    year: int,
+    day: int,
+    part: int | None = None,
+    stream: bool = False,
+    path: pathlib.Path | None = None,
+    memory_map: bool = False,
+    workers: int = 1,
+) -> list[Result]:
+    """
+    Solve the puzzle for the input year and day
+
+    :param year: The year of the puzzle
+    :param day: The day of the puzzle
+    :param part: the part of the puzzle to solve. If None, solve both parts.
+    :param stream:
+        If True, and the solution declares that it can stream its input
+        by setting STREAMING = True, pass it an iterator over the lines
+        of the puzzle input instead of a list of every line.
+        Solutions set it when they only read the lines once, in order,
+        so the input never has to be read into memory all at once,
+        though they may still keep what they need from each line
+    :param path:
+        The puzzle input to solve, e.g. a generated input.
+        If None, use the real puzzle input for the year and day.
+    :param memory_map:
+        If True, and the solution declares that it can read raw bytes
+        by setting MAPPABLE = True, pass it a read only memory map of the
+        puzzle input instead of a list of every line
+    :param workers:
+        The number of worker processes to pass to the solution,
+        if it declares that it can use them by setting PARALLEL = True
+    :returns: the answers to the solved parts of the puzzle
+    """
+
+    module = importlib.import_module(f"{YEARS[year]}.day_{day:02d}")
+    options = {"part": part}
+    if getattr(module, "PARALLEL", False):
+        options["workers"] = workers
+    if path is None:
+        path = _puzzle_path(year, day)
+
+    if memory_map and getattr(module, "MAPPABLE", False):
+        # Empty files cannot be memory mapped
+        if path.stat().st_size == 0:
+            return module.solve(b"", **options)
+        with open(path, "rb") as data:
+            with mmap.mmap(
+                data.fileno(), 0, access=mmap.ACCESS_READ
+            ) as buffer:
+                try:
+                    return module.solve(buffer, **options)
+                except Exception as error:
+                    # The frames of the traceback can still hold views of
+                    # the map, which would stop it from being closed
+                    traceback.clear_frames(error.__traceback__)
+                    raise
+
+    if stream and getattr(module, "STREAMING", False):
+        puzzle = read_lines(path)
+    else:
+        with open(path, "r") as data:
+            puzzle = data.read().splitlines()
+    return module.solve(puzzle, **options)
+
+
+def run_batch(
+    days: list[tuple[int, int]],
+    part: int | None = None,
+    workers: int | None = None,
+    stream: bool = False,
+    memory_map: bool = False,
+) -> list[tuple[int, int, list[Result], str | None]]:
+    """
+    Solve many puzzles at once, spreading them across a pool of processes.
+
+    The results are returned in the same order as the input days,
+    regardless of the order in which the puzzles finish.
+    A puzzle that raises an error is reported along with the others,
+    rather than stopping the whole batch.
+
+    :param days: The (year, day) pairs to solve
+    :param part: the part of the puzzles to solve. If None, solve both parts.
+    :param workers:
+        The number of worker processes.
+        If None, use the number of processors on the machine.
+        Each puzzle is solved within a single worker process.
+    :param stream: If True, stream the inputs of solutions that support it
+    :param memory_map:
+        If True, memory map the inputs of solutions that support it
+    :returns:
+        A list of (year, day, results, error) tuples, where error is None,
+        or describes the error raised while solving the puzzle, in which
+        case the results are empty
+    """
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                run_day,
+                year,
+                day,
+                part=part,
+                stream=stream,
+                memory_map=memory_map,
+                workers=1,
+            )
+            for year, day in days
+        ]
+        solved = []
+        for (year, day), future in zip(days, futures):
+            try:
+                solved.append((year, day, future.result(), None))
+            except Exception as error:
+                message = f"{type(error).__name__}: {error}"
+                solved.append((year, day, [], message))
+
+    return solved
@@ -0,0 +1,156 @@
+"""
+Python Advent of Code - solution.py
+
+Common code for the solve() function of every puzzle.
+
+Every solve() returns a list of Results, so that answers can be printed,
+compared, cached, or timed by the caller without capturing printed output.
+"""
+
+import concurrent.futures
+import dataclasses
+import itertools
+import mmap
+import time
+from collections.abc import Callable, Iterable, Iterator
+
+
+@dataclasses.dataclass(frozen=True)
+class Result:
+    """
+    The answer to one part of a puzzle
+
+    :param part: The part of the puzzle that was solved
+    :param answer: The answer to the part of the puzzle
+    :param elapsed: The time spent finding the answer, in seconds
+    :param message: A human readable description of the answer
+    """
+
+    part: int
+    answer: int | str | None
+    elapsed: float
+    message: str
+
+    def to_dict(self) -> dict:
+        """
+        Convert the result into a JSON serializable dict
+
+        :returns: A dict of the fields of the result
+        """
+
+        return dataclasses.asdict(self)
+
+
+class Stopwatch:
+    """
+    A timer for building Results while solving a puzzle.
+
+    Each Result is given the time elapsed since the previous Result was made,
+    or since the Stopwatch was started for the first Result.
+    When both parts share some work, that work is counted towards
+    whichever part is answered first.
+    """
+
+    def __init__(self) -> None:
+        self._lap_start = time.perf_counter()
+
+    def result(
+        self, part: int, answer: int | str | None, message: str
+    ) -> Result:
+        """
+        Record the answer to a part of the puzzle
+
+        :param part: The part of the puzzle that was solved
+        :param answer: The answer to the part of the puzzle
+        :param message: A human readable description of the answer
+        :returns: The Result for the part
+        """
+
+        lap_end = time.perf_counter()
+        elapsed = lap_end - self._lap_start
+        self._lap_start = lap_end
+
+        return Result(
+            part=part, answer=answer, elapsed=elapsed, message=message
+        )
+
+
+def as_bytes(puzzle: list[str] | bytes | mmap.mmap) -> memoryview:
+    """
+    Get a view of the raw bytes of a puzzle input.
+
+    Solutions that set MAPPABLE = True can be passed the raw bytes of the
+    puzzle file, e.g. as an mmap, instead of a list of lines.
+    This accepts either form, and only copies the input in the first case.
+    Any line endings at the end of the input are excluded from the view.
+
+    :param puzzle: the lines of the puzzle file, or its raw bytes
+    :returns: A view of the bytes of the puzzle input
+    """
+
+    if isinstance(puzzle, list):
+        return memoryview("\n".join(puzzle).encode("ascii"))
+
+    view = memoryview(puzzle)
+    end = len(view)
+    while end > 0 and view[end - 1] in b"\r\n":
+        end = end - 1
+    return view[:end]
+
+
+def chunks(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable, e.g. the lines of a puzzle file, into lists
+
+    :param items: The items to split
+    :param size: The most items to put in each list
+    :returns: An iterator over lists of up to size items, in order
+    """
+
+    items = iter(items)
+    while chunk := list(itertools.islice(items, size)):
+        yield chunk
+
+
+def parallel_map(
+    function: Callable, items: Iterable, workers: int
+) -> Iterator:
+    """
+    Apply a function to each item in a pool of worker processes,
+    yielding the results in the order of the items.
+
+    Solutions that set PARALLEL = True take a workers argument, and split
+    their input into independent pieces, e.g. blocks of bytes or chunks of
+    lines, which are handed to this function when workers is more than 1.
+    Otherwise, they map the pieces in their own process, so that no pool is
+    started unless it is asked for, and puzzles solved in a batch, which
+    already runs across a pool of processes, never start pools of their own.
+
+    Only two items per worker are taken from the iterable ahead of the
+    results being consumed, so large inputs can be split up and streamed
+    through the pool without all being held in memory at once.
+    Because the results come back in order, the first result meeting some
+    condition is the same as it would be in a single process.
+    If the caller stops early, the items not yet started are cancelled.
+
+    :param function: The function to apply, which must be picklable
+    :param items: The items to apply the function to
+    :param workers: The number of worker processes
+    :returns: An iterator over the result for each item
+    """
+
+    items = iter(items)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = [
+            pool.submit(function, item)
+            for item in itertools.islice(items, 2 * workers)
+        ]
+        try:
+            while in_flight:
+                result = in_flight.pop(0).result()
+                for item in itertools.islice(items, 1):
+                    in_flight.append(pool.submit(function, item))
+                yield result
+        finally:
+            for future in in_flight:
+                future.cancel()
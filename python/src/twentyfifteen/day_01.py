@@ -16,40 +16,140 @@ At what position in the list of characters does Santa first enter
 the basement?
 """
 
+import itertools
+import mmap
+import operator
+from collections.abc import Iterator
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+from solution import Result, Stopwatch, as_bytes, parallel_map
+
+# The input can be read as raw bytes, e.g. from a memory map
+MAPPABLE = True
+
+# Large inputs can be split across worker processes
+PARALLEL = True
+
+# The number of bytes of the input to process at once
+BLOCK_SIZE = 1 << 20
+
+# Maps "(" to +1 and ")" to -1, when read as signed bytes
+FLOOR_CHANGES = bytes.maketrans(b"()", b"\x01\xff")
+
+# Inputs with fewer blocks than this are not worth starting processes for
+MIN_PARALLEL_BLOCKS = 16
+
+
+def _summarize(block: bytes, exact: bool = True) -> tuple[int, int]:
+    """
+    Find the change in floor over a block of instructions,
+    and the lowest floor reached within the block
+
+    :param block: The "(" and ")" characters of the block
+    :param exact:
+        Whether to find the lowest floor exactly, or to only bound it by
+        the number of ")" characters, which is much faster
+    :returns:
+        A tuple of the change in floor, and the lowest floor reached after
+        any character of the block (or a lower bound on it),
+        both relative to the floor before the block
+    """
+
+    num_up = block.count(b"(")
+    num_down = block.count(b")")
+    if num_up + num_down != len(block):
+        char = chr(block.translate(None, b"()")[0])
+        raise ValueError(f"Received an unexpected input character: {char}")
+
+    if not exact:
+        return num_up - num_down, -num_down
+    changes = memoryview(block.translate(FLOOR_CHANGES)).cast("b")
+    return num_up - num_down, min(itertools.accumulate(changes))
+
+
+def _summarize_blocks(
+    chars: memoryview, workers: int = 1
+) -> Iterator[tuple[int, int]]:
+    """
+    Summarize each block of the instructions, in order.
+
+    Blocks are independent of each other, so large inputs can be summarized
+    by worker processes, which find the lowest floor of each block exactly,
+    while blocks summarized in this process only get a lower bound.
+
+    :param chars: The "(" and ")" characters of the input
+    :param workers: The number of worker processes to use for large inputs
+    :returns: An iterator over the summary of each block
+    """
+
+    # Only one block is ever copied out of the input per worker at a time
+    blocks = (
+        bytes(chars[start:start + BLOCK_SIZE])
+        for start in range(0, len(chars), BLOCK_SIZE)
+    )
+
+    if workers == 1 or len(chars) < MIN_PARALLEL_BLOCKS * BLOCK_SIZE:
+        for block in blocks:
+            yield _summarize(block, exact=False)
+        return
+
+    yield from parallel_map(_summarize, blocks, workers)
+
+
+def solve(
+    puzzle: list[str] | bytes | mmap.mmap,
+    part: int | None = None,
+    workers: int = 1,
+) -> list[Result]:
     """
     Solve the 2015 Day 1 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, or its raw bytes
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :param workers: the number of worker processes to use for large inputs
+    :returns: the answers to the solved parts of the puzzle
     """
 
-    if len(puzzle) > 1:
+    stopwatch = Stopwatch()
+    results = []
+
+    if isinstance(puzzle, list) and len(puzzle) > 1:
         raise ValueError(
             f"Unexpected puzzle length: expected a length of 1, "
             f"but found {len(puzzle)}."
         )
 
-    chars = puzzle[0]
+    chars = as_bytes(puzzle)
 
+    # Only the block where the floor first reaches the basement needs to be
+    # searched for the position of the first entry
     floor = 0
     first_basement_entry = None
-    for char_num, char in enumerate(chars):
-        if char == "(":
-            floor = floor + 1
-        elif char == ")":
-            floor = floor - 1
-        else:
-            raise ValueError(f"Received an unexpected input character: {char}")
+    summaries = _summarize_blocks(chars, workers)
+    for index, (change, lowest) in enumerate(summaries):
+        if first_basement_entry is None and floor + lowest <= -1:
+            start = index * BLOCK_SIZE
+            block = bytes(chars[start:start + BLOCK_SIZE])
+            changes = memoryview(block.translate(FLOOR_CHANGES)).cast("b")
+            # The lower bound rarely rules a block out,
+            # so check the exact lowest floor of the block first
+            if floor + min(itertools.accumulate(changes)) <= -1:
+                # The running floor after each character of the block,
+                # starting with the floor before the block.
+                # The floor moves one at a time, so it must reach -1 exactly
+                floors = itertools.accumulate(changes, initial=floor)
+                # Position is 1-indexed
+                first_basement_entry = start + operator.indexOf(floors, -1)
 
-        if floor == -1 and first_basement_entry is None:
-            first_basement_entry = char_num + 1  # Position is 1-indexed
+        floor = floor + change
 
     if part == 1 or part is None:
-        print(f"Part 1: Santa ends up on floor {floor}")
+        message = f"Part 1: Santa ends up on floor {floor}"
+        results.append(stopwatch.result(1, floor, message))
     if part == 2 or part is None:
-        print(
+        message = (
             f"Part 2: Santa first ends up in the basement at position "
             f"{first_basement_entry}"
         )
+        results.append(stopwatch.result(2, first_basement_entry, message))
+
+    return results
@@ -14,54 +14,132 @@ Part 2
 How much total ribbon do the elves need?
 """
 
+import itertools
+import operator
+from array import array
+from collections.abc import Iterable
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+from solution import Result, Stopwatch, chunks, parallel_map
+
+STREAMING = True
+
+# Large inputs can be split across worker processes
+PARALLEL = True
+
+# The number of boxes to parse and total at once
+SHARD_SIZE = 1 << 16
+
+
+def _shard_totals(shard: list[str]) -> tuple[int, int]:
     """
-    Solve the 2015 Day 2 puzzle.
+    Find the wrapping paper and ribbon needed for a shard of the boxes.
 
-    :param puzzle: the contents of the puzzle file
-    :param part: the part of the puzzle to solve. If None, solve both parts.
+    The shard is parsed into columns of lengths, widths, and heights,
+    and the totals are found column by column, rather than box by box.
+
+    :param shard: The lines of the shard, each of the form LxWxH
+    :returns: A tuple of the square feet of paper and the feet of ribbon
     """
 
-    total_paper_sqft = 0
-    total_ribbon_ft = 0
-    for dimensions in puzzle:
-        dims = dimensions.split("x")
-        if len(dims) != 3:
-            raise ValueError(
-                f"Found an unexpected line.\n"
-                f"Expected a form of 'LxWxH', but found '{dimensions}'"
-            )
-        (length, width, height) = (int(x) for x in dims)
-        volume = length * width * height
-
-        # The elves need enough wrapping paper for the surface area of the
-        # rectangular prism, plus the area of the smallest face
-        areas_sqft = (
-            length * width,
-            length * height,
-            width * height,
-        )
-        total_paper_sqft = (
-            total_paper_sqft + min(areas_sqft) + 2 * sum(areas_sqft)
+    num_separators = list(map(str.count, shard, itertools.repeat("x")))
+    if num_separators.count(2) != len(shard):
+        dimensions = shard[next(
+            index for index, count in enumerate(num_separators) if count != 2
+        )]
+        raise ValueError(
+            f"Found an unexpected line.\n"
+            f"Expected a form of 'LxWxH', but found '{dimensions}'"
         )
+    values = array("q", map(int, "x".join(shard).split("x")))
+    lengths = values[0::3]
+    widths = values[1::3]
+    heights = values[2::3]
+
+    # The elves need enough wrapping paper for the surface area of the
+    # rectangular prism, plus the area of the smallest face
+    areas_1 = array("q", map(operator.mul, lengths, widths))
+    areas_2 = array("q", map(operator.mul, lengths, heights))
+    areas_3 = array("q", map(operator.mul, widths, heights))
+    paper_sqft = (
+        2 * (sum(areas_1) + sum(areas_2) + sum(areas_3))
+        + sum(map(min, areas_1, areas_2, areas_3))
+    )
 
-        # The elves need enough ribbon to wrap the shortest perimeter of any
-        # face, plus the volume of the prism for the bow
-        perimeters_ft = (
-            2 * (length + width),
-            2 * (length + height),
-            2 * (width + height),
+    # The elves need enough ribbon to wrap the shortest perimeter of any
+    # face, which leaves out the longest side, plus the volume of the prism
+    # for the bow
+    ribbon_ft = (
+        2 * (
+            sum(lengths) + sum(widths) + sum(heights)
+            - sum(map(max, lengths, widths, heights))
         )
-        total_ribbon_ft = total_ribbon_ft + min(perimeters_ft) + volume
+        + sum(map(operator.mul, areas_1, heights))
+    )
+
+    return paper_sqft, ribbon_ft
+
+
+def _totals(
+    puzzle: Iterable[str], workers: int = 1
+) -> tuple[int, int]:
+    """
+    Find the wrapping paper and ribbon needed for every box.
+
+    Inputs of more than one shard can be totalled by worker processes
+    while the input is read.
+
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
+    :param workers: The number of worker processes to use for large inputs
+    :returns: A tuple of the square feet of paper and the feet of ribbon
+    """
+
+    shards = chunks(puzzle, SHARD_SIZE)
+    first = next(shards, None)
+    if first is None:
+        return 0, 0
+    shards = itertools.chain([first], shards)
+    if workers == 1 or len(first) < SHARD_SIZE:
+        totals = map(_shard_totals, shards)
+    else:
+        totals = parallel_map(_shard_totals, shards, workers)
+
+    paper_sqft = 0
+    ribbon_ft = 0
+    for shard_paper_sqft, shard_ribbon_ft in totals:
+        paper_sqft = paper_sqft + shard_paper_sqft
+        ribbon_ft = ribbon_ft + shard_ribbon_ft
+
+    return paper_sqft, ribbon_ft
+
+
+def solve(
+    puzzle: Iterable[str], part: int | None = None, workers: int = 1
+) -> list[Result]:
+    """
+    Solve the 2015 Day 2 puzzle.
+
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
+    :param part: the part of the puzzle to solve. If None, solve both parts.
+    :param workers: the number of worker processes to use for large inputs
+    :returns: the answers to the solved parts of the puzzle
+    """
+
+    stopwatch = Stopwatch()
+    results = []
+
+    total_paper_sqft, total_ribbon_ft = _totals(puzzle, workers)
 
     if part == 1 or part is None:
-        print(
+        message = (
             f"Part 1: The elves need a total of "
             f"{total_paper_sqft} square feet of wrapping paper."
         )
+        results.append(stopwatch.result(1, total_paper_sqft, message))
     if part == 2 or part is None:
-        print(
+        message = (
             f"Part 2: The elves need a total of "
             f"{total_ribbon_ft} feet of ribbon."
         )
+        results.append(stopwatch.result(2, total_ribbon_ft, message))
+
+    return results
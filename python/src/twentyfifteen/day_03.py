@@ -15,87 +15,177 @@ How many houses receive at least one present, when the instructions are
 split among Santa and Robo-Santa?
 """
 
+import mmap
+from collections.abc import Iterable
 
-def _update_coordinates(char: str, coords: tuple[int, int]) -> int:
+from solution import Result, Stopwatch, as_bytes
+
+# The input can be read as raw bytes, e.g. from a memory map
+MAPPABLE = True
+
+# The number of bytes of the input to deliver at once
+BLOCK_SIZE = 1 << 20
+
+# Houses are packed into single integers as (x + OFFSET) << 32 | (y + OFFSET),
+# which stays unique for routes of fewer than 2**30 moves
+OFFSET = 1 << 30
+START = OFFSET << 32 | OFFSET
+
+# The change in the packed house for each instruction, indexed by its byte
+MOVES = [0] * 256
+MOVES[ord("<")] = -(1 << 32)
+MOVES[ord(">")] = 1 << 32
+MOVES[ord("v")] = -1
+MOVES[ord("^")] = 1
+
+# Visited houses are marked in tiles of 64 by 64 houses, one bit per house.
+# Shifting a packed house right by 6 leaves (x << 26) | (y >> 6),
+# so masking out the low 6 bits of x gives the key of its tile.
+TILE_KEY_MASK = ~(63 << 26)
+TILE_BYTES = 64 * 64 // 8
+
+
+class Delivery:
     """
-    Update the provided coordinate based on the input character
+    A class representing a team of deliverers taking turns following the
+    instructions, starting from the same house.
 
-    :param char: The instruction character
-    :param coord: The coordinates to update
-    :returns: The updated coordinate
+    The visited houses are stored as a sparse bitmap, a dict mapping the
+    key of each tile of 64 by 64 houses that has been visited to a bytearray
+    with one bit per house in it, so each house takes around one bit once its
+    tile fills up, rather than a Python object and a slot in a set.
     """
 
-    VALID_CHARS = {"<", ">", "^", "v"}
-    if char not in VALID_CHARS:
-        raise ValueError(
-            f"Received a character that is not a valid instruction."
-            f"The character should be an element of {VALID_CHARS}, not {char}."
+    def __init__(self, num_deliverers: int) -> None:
+        self.num_deliverers = num_deliverers
+        self.houses = [START] * num_deliverers
+        self.turn = 0
+        self.tiles = dict()
+        # The starting house receives a gift
+        self._visit(START)
+
+    @property
+    def num_visited(self) -> int:
+        """
+        The number of houses that have received at least one gift
+        """
+
+        return sum(
+            int.from_bytes(tile, "big").bit_count()
+            for tile in self.tiles.values()
         )
 
-    if len(coords) != 2:
-        raise ValueError(
-            f"Received unexpected coordinates.\n"
-            f"The coordinates should be a tuple of (x, y), "
-            f"but received {coords}"
-        )
+    def _visit(self, house: int) -> None:
+        """
+        Mark a house as having received a gift
+
+        :param house: The packed house
+        """
+
+        key = house >> 6 & TILE_KEY_MASK
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = bytearray(TILE_BYTES)
+        # Each row of a tile is 8 bytes, indexed by the low 6 bits of x
+        tile[house >> 29 & 0x1F8 | house >> 3 & 7] |= 1 << (house & 7)
+
+    def deliver(self, instructions: bytes) -> None:
+        """
+        Follow a block of instructions,
+        continuing from wherever the last block left off
+
+        :param instructions: The instructions, as "<", ">", "v", or "^" bytes
+        """
+
+        if instructions.translate(None, b"<>v^"):
+            raise ValueError(
+                "Received a character that is not a valid instruction. "
+                "Every character should be one of '<', '>', 'v', or '^'."
+            )
+
+        num_deliverers = self.num_deliverers
+        houses = self.houses
+        tiles = self.tiles
+        turn = self.turn
+        # This repeats _visit inline, which is too slow to call per move
+        for move in instructions:
+            house = houses[turn] + MOVES[move]
+            houses[turn] = house
+
+            key = house >> 6 & TILE_KEY_MASK
+            tile = tiles.get(key)
+            if tile is None:
+                tile = tiles[key] = bytearray(TILE_BYTES)
+            tile[house >> 29 & 0x1F8 | house >> 3 & 7] |= 1 << (house & 7)
+
+            turn = turn + 1
+            if turn == num_deliverers:
+                turn = 0
+
+        self.turn = turn
+
+
+def _count_houses(
+    data: bytes | memoryview, team_sizes: Iterable[int]
+) -> dict[int, int]:
+    """
+    Count the houses visited by teams of different numbers of deliverers,
+    who take turns following the instructions.
+
+    Every team follows each block of the instructions before the next
+    block is read, so the instructions are only read once for all teams.
+
+    :param data: The instructions, as "<", ">", "v", or "^" bytes
+    :param team_sizes: The numbers of deliverers in each team
+    :returns: A dict mapping each team size to the number of houses visited
+    """
+
+    teams = [Delivery(team_size) for team_size in team_sizes]
+    for start in range(0, len(data), BLOCK_SIZE):
+        block = bytes(data[start:start + BLOCK_SIZE])
+        for team in teams:
+            team.deliver(block)
 
-    if char == "<":
-        return (coords[0] - 1, coords[1])
-    if char == ">":
-        return (coords[0] + 1, coords[1])
-    if char == "v":
-        return (coords[0], coords[1] - 1)
-    if char == "^":
-        return (coords[0], coords[1] + 1)
+    return {team.num_deliverers: team.num_visited for team in teams}
 
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+def solve(
+    puzzle: list[str] | bytes | mmap.mmap, part: int | None = None
+) -> list[Result]:
     """
     Solve the 2015 Day 3 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, or its raw bytes
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
-    if len(puzzle) > 1:
+    stopwatch = Stopwatch()
+    results = []
+
+    if isinstance(puzzle, list) and len(puzzle) > 1:
         raise ValueError(
             f"Unexpected puzzle length: expected a length of 1, "
             f"but found {len(puzzle)}."
         )
-    chars = puzzle[0]
-
-    # The starting house receives a gift in both cases
-    houses_solo = 1
-    houses_team = 1
-
-    coord_solo_santa = (0, 0)
-    coord_team_robo = (0, 0)
-    coord_team_santa = (0, 0)
-    coord_solo_visited = {coord_solo_santa}
-    coord_team_visited = {coord_team_robo, coord_team_santa}
-    for char_num, char in enumerate(chars):
-        # Solo Santa always updates
-        coord_solo_santa = _update_coordinates(char, coord_solo_santa)
-        if coord_solo_santa not in coord_solo_visited:
-            houses_solo = houses_solo + 1
-            coord_solo_visited.add(coord_solo_santa)
-
-        # Team Santa and Robo-Santa alternate updating
-        if char_num % 2:
-            coord_team_robo = _update_coordinates(char, coord_team_robo)
-            if coord_team_robo not in coord_team_visited:
-                houses_team = houses_team + 1
-                coord_team_visited.add(coord_team_robo)
-        else:
-            coord_team_santa = _update_coordinates(char, coord_team_santa)
-            if coord_team_santa not in coord_team_visited:
-                houses_team = houses_team + 1
-                coord_team_visited.add(coord_team_santa)
+    data = as_bytes(puzzle)
+
+    # Santa delivers alone, or alternates with Robo-Santa
+    houses = _count_houses(data, [1, 2])
+    houses_solo = houses[1]
+    houses_team = houses[2]
 
     if part == 1 or part is None:
-        print(f"Part 1: Santa delivers gifts to a total of {houses_solo} houses.")
-    if part == 1 or part is None:
-        print(
+        message = (
+            f"Part 1: Santa delivers gifts "
+            f"to a total of {houses_solo} houses."
+        )
+        results.append(stopwatch.result(1, houses_solo, message))
+    if part == 2 or part is None:
+        message = (
             f"Part 2: Santa and Robo-Santa deliver gifts "
             f"to a total of {houses_team} houses."
         )
+        results.append(stopwatch.result(2, houses_team, message))
+
+    return results
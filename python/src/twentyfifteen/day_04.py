@@ -16,37 +16,249 @@ six leading zeros?
 
 import hashlib
 
+from solution import Result, Stopwatch, parallel_map
 
-def _generate_hash(key: str, num_zeros: int) -> int:
+# The search can be split across worker processes
+PARALLEL = True
+
+# The number of integers each worker checks at a time.
+# Blocks are a multiple of 1000, so they split evenly into runs of integers
+# sharing every digit except for the last three.
+BLOCK_SIZE = 100_000
+
+# The last three digits of every integer of at least four digits
+SUFFIXES = [b"%03d" % suffix for suffix in range(1000)]
+
+
+def _limit(num_zeros: int) -> bytes:
     """
-    Generate an MD5 hash of the input key with a number of leading zeros
+    Find the smallest MD5 digest without a number of leading zeros.
+
+    Digests compare as big-endian numbers, so a digest starts with
+    num_zeros hexadecimal zeros exactly when it is less than this limit.
 
-    :param key: The input to hash
     :param num_zeros: The number of zeros the hash must start with
-    :returns: The first positive integer that generates the required hash
+    :returns: The limit, as a 16 byte digest
+    """
+
+    return (1 << 4 * (32 - num_zeros)).to_bytes(17, "big")[1:]
+
+
+def _count_zeros(digest: bytes) -> int:
+    """
+    Count the leading hexadecimal zeros of an MD5 digest
+
+    :param digest: The raw digest
+    :returns: The number of leading zeros of the hexadecimal digest
+    """
+
+    return (128 - int.from_bytes(digest, "big").bit_length()) // 4
+
+
+def _scan_simple(
+    key: str, start: int, stop: int, zeros: tuple[int, ...]
+) -> dict[int, int]:
     """
+    Find the first integer in a range that generates an MD5 hash
+    with each number of leading zeros, hashing each integer separately.
 
-    hash_start = "0" * num_zeros
-    integer = 0
-    solution = None
-    while solution is None:
-        integer = integer + 1
+    This is only used for integers below 1000, which don't share
+    a common prefix.
+
+    :param key: The input to hash
+    :param start: The first integer in the range
+    :param stop: The integer after the last integer in the range
+    :param zeros: The numbers of zeros the hash must start with
+    :returns:
+        A dict mapping each number of zeros to the first integer within the
+        range that generates a hash with at least that many leading zeros,
+        leaving out any number of zeros that no integer in the range meets
+    """
+
+    pending = sorted(zeros)
+    found = dict()
+    for integer in range(start, stop):
         md5 = hashlib.md5()
         md5.update(f"{key}{integer}".encode("utf-8"))
-        if md5.hexdigest().startswith(hash_start):
-            solution = integer
+        digest = md5.hexdigest()
+        # The smallest pending number of zeros is the cheapest to rule out
+        if not digest.startswith("0" * pending[0]):
+            continue
+        num_zeros = len(digest) - len(digest.lstrip("0"))
+        while pending and num_zeros >= pending[0]:
+            found[pending.pop(0)] = integer
+        if not pending:
+            break
+
+    return found
+
+
+def _scan_block(
+    key: str, start: int, stop: int, zeros: tuple[int, ...]
+) -> dict[int, int]:
+    """
+    Find the first integer in a block that generates an MD5 hash
+    with each number of leading zeros.
+
+    The key, and then every run of a thousand integers that only differ
+    in their last three digits, is hashed once, and that MD5 state is
+    copied for each integer, so only the last three digits are hashed
+    per integer. Digests are compared as raw bytes instead of as strings.
+
+    :param key: The input to hash
+    :param start: The first integer in the block, a multiple of 1000
+    :param stop: The integer after the last integer in the block,
+        a multiple of 1000
+    :param zeros: The numbers of zeros the hash must start with
+    :returns:
+        A dict mapping each number of zeros to the first integer within the
+        block that generates a hash with at least that many leading zeros,
+        leaving out any number of zeros that no integer in the block meets
+    """
+
+    pending = sorted(zeros)
+    found = dict()
+
+    if start < 1000:
+        # Integers below 1000 don't have three digit suffixes
+        found = _scan_simple(key, max(start, 1), 1000, zeros)
+        pending = [
+            num_zeros for num_zeros in pending if num_zeros not in found
+        ]
+        start = 1000
+        if not pending:
+            return found
+
+    key_md5 = hashlib.md5(key.encode("utf-8"))
+    limit = _limit(pending[0])
+    for prefix in range(start // 1000, stop // 1000):
+        prefix_md5 = key_md5.copy()
+        prefix_md5.update(b"%d" % prefix)
+        for suffix, suffix_bytes in enumerate(SUFFIXES):
+            md5 = prefix_md5.copy()
+            md5.update(suffix_bytes)
+            digest = md5.digest()
+            # The smallest pending number of zeros is the cheapest to rule out
+            if digest >= limit:
+                continue
+            num_zeros = _count_zeros(digest)
+            while pending and num_zeros >= pending[0]:
+                found[pending.pop(0)] = prefix * 1000 + suffix
+            if not pending:
+                return found
+            limit = _limit(pending[0])
 
-    return solution
+    return found
 
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+def scan(
+    key: str,
+    start: int,
+    stop: int,
+    zeros: tuple[int, ...],
+    prefix: bool = True,
+) -> dict[int, int]:
+    """
+    Find the first integer in a range that generates an MD5 hash
+    with each number of leading zeros, e.g. to measure the hash rate.
+
+    :param key: The input to hash
+    :param start:
+        The first integer in the range, a multiple of 1000 if prefix is True
+    :param stop:
+        The integer after the last integer in the range,
+        a multiple of 1000 if prefix is True
+    :param zeros: The numbers of zeros the hash must start with
+    :param prefix:
+        If True, reuse the MD5 state of the digits shared by each run of
+        a thousand integers, as the solution does.
+        If False, hash each integer separately.
+    :returns:
+        A dict mapping each number of zeros to the first integer within the
+        range that generates a hash with at least that many leading zeros,
+        leaving out any number of zeros that no integer in the range meets
+    """
+
+    if not prefix:
+        return _scan_simple(key, start, stop, zeros)
+    if start % 1000 or stop % 1000:
+        raise ValueError(
+            f"The range must start and stop on multiples of 1000, "
+            f"not {start} and {stop}."
+        )
+    return _scan_block(key, start, stop, zeros)
+
+
+def _scan_task(task: tuple[str, int, int, tuple[int, ...]]) -> dict[int, int]:
+    """
+    Check one block of integers, for use with solution.parallel_map
+
+    :param task: The arguments of _scan_block
+    :returns: The result of _scan_block
+    """
+
+    return _scan_block(*task)
+
+
+def _generate_hashes(
+    key: str, zeros: tuple[int, ...], workers: int = 1
+) -> dict[int, int]:
+    """
+    Find the first positive integers that generate MD5 hashes of the input
+    key with each number of leading zeros, in a single scan.
+
+    The integers are split into blocks, which can be checked by worker
+    processes. The results of the blocks are merged in order, so the first
+    integer found for each number of zeros is the smallest one, no matter
+    which block finishes first. Once every number of zeros has been found,
+    no more blocks are checked.
+
+    :param key: The input to hash
+    :param zeros: The numbers of zeros the hashes must start with
+    :param workers: The number of worker processes
+    :returns: A dict mapping each number of zeros to its first integer
+    """
+
+    solutions = dict()
+    pending = tuple(zeros)
+
+    def tasks():
+        # Later blocks only look for the numbers of zeros still pending
+        for start in range(0, 2**63, BLOCK_SIZE):
+            yield key, start, start + BLOCK_SIZE, pending
+
+    if workers == 1:
+        results = map(_scan_task, tasks())
+    else:
+        results = parallel_map(_scan_task, tasks(), workers)
+
+    for found in results:
+        for num_zeros, integer in found.items():
+            # Every earlier block has already been merged
+            if num_zeros not in solutions:
+                solutions[num_zeros] = integer
+        pending = tuple(n for n in zeros if n not in solutions)
+        if not pending:
+            break
+
+    return solutions
+
+
+def solve(
+    puzzle: list[str], part: int | None = None, workers: int = 1
+) -> list[Result]:
     """
     Solve the 2015 Day 4 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :param workers: the number of worker processes to use
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     if len(puzzle) > 1:
         raise ValueError(
             f"Unexpected puzzle length: expected a length of 1, "
@@ -54,13 +266,24 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
         )
     key = puzzle[0]
 
+    # Any hash with six leading zeros also has five, so both parts share
+    # a single scan through the integers
+    zeros = {1: (5,), 2: (6,), None: (5, 6)}[part]
+    solutions = _generate_hashes(key, zeros, workers)
+
     if part == 1 or part is None:
-        print(
+        integer_1 = solutions[5]
+        message = (
             f"Part 1: The integer which produces five leading zeroes is "
-            f"{_generate_hash(key, 5)}"
+            f"{integer_1}"
         )
+        results.append(stopwatch.result(1, integer_1, message))
     if part == 2 or part is None:
-        print(
+        integer_2 = solutions[6]
+        message = (
             f"Part 2: The integer which produces six leading zeroes is "
-            f"{_generate_hash(key, 6)}"
+            f"{integer_2}"
         )
+        results.append(stopwatch.result(2, integer_2, message))
+
+    return results
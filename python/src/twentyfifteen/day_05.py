@@ -27,63 +27,340 @@ A nice string is one with all of the following properties:
    like xyx, abcdefeghi (efe), or even aaa.
 """
 
+import collections
+import dataclasses
+import itertools
+from collections.abc import Callable, Generator, Iterable
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+from solution import Result, Stopwatch, chunks, parallel_map
+
+STREAMING = True
+
+# Large inputs can be split across worker processes
+PARALLEL = True
+
+# The number of strings to classify at once
+CHUNK_SIZE = 1 << 16
+
+# The letters counted as vowels
+VOWELS = frozenset("aeiou")
+
+
+@dataclasses.dataclass(frozen=True)
+class Predicate:
+    """
+    A property of a string, checked one character at a time.
+
+    The check is a generator function, called with the arguments and
+    primed with next(), which is then sent each character of the string
+    in turn, followed by None, and yields whether the string has the
+    property in reply to the None.
+    Predicates with the same check and arguments are equal, so a predicate
+    shared by several rule sets is only checked once per string.
+
+    :param description: A human readable description of the property
+    :param check: The generator function that checks the property
+    :param arguments: The arguments of the check
+    """
+
+    description: str
+    check: Callable[..., Generator[bool | None, str | None, None]]
+    arguments: tuple = ()
+
+
+def _check_vowels(count: int) -> Generator[bool | None, str | None, None]:
+    """
+    :param count: The least number of vowels
+    :returns: A check for containing at least count vowels
+    """
+
+    num_vowels = 0
+    while (char := (yield)) is not None:
+        if char in VOWELS:
+            num_vowels = num_vowels + 1
+    yield num_vowels >= count
+
+
+def _check_doubled_letter() -> Generator[bool | None, str | None, None]:
+    """
+    :returns: A check for containing a letter twice in a row
+    """
+
+    found = False
+    previous_char = None
+    while (char := (yield)) is not None:
+        if char == previous_char:
+            found = True
+        previous_char = char
+    yield found
+
+
+def _check_forbidden(
+    bigrams: frozenset[str],
+) -> Generator[bool | None, str | None, None]:
+    """
+    :param bigrams: The two letter strings to look for
+    :returns: A check for containing any of the bigrams
+    """
+
+    found = False
+    previous_char = ""
+    while (char := (yield)) is not None:
+        if previous_char + char in bigrams:
+            found = True
+        previous_char = char
+    yield found
+
+
+def _check_repeated_pair() -> Generator[bool | None, str | None, None]:
+    """
+    :returns: A check for containing a pair twice without overlapping
+    """
+
+    found = False
+    # The index of the first occurrence of each pair
+    first_indices = dict()
+    previous_char = None
+    index = 0
+    while (char := (yield)) is not None:
+        if previous_char is not None and not found:
+            first_index = first_indices.setdefault(previous_char + char, index)
+            if index - first_index >= 2:
+                found = True
+        previous_char = char
+        index = index + 1
+    yield found
+
+
+def _check_split_repeat() -> Generator[bool | None, str | None, None]:
+    """
+    :returns: A check for containing a letter repeated with one between
+    """
+
+    found = False
+    previous_char = None
+    char_before = None
+    while (char := (yield)) is not None:
+        if char == char_before:
+            found = True
+        char_before = previous_char
+        previous_char = char
+    yield found
+
+
+def vowels(count: int) -> Predicate:
+    """
+    :param count: The least number of vowels
+    :returns: A predicate for containing at least count vowels (aeiou)
+    """
+
+    return Predicate(f"at least {count} vowels", _check_vowels, (count,))
+
+
+def doubled_letter() -> Predicate:
+    """
+    :returns: A predicate for containing a letter twice in a row, like xx
+    """
+
+    return Predicate("a letter twice in a row", _check_doubled_letter)
+
+
+def forbidden(strings: Iterable[str]) -> Predicate:
+    """
+    :param strings: The two letter strings to look for
+    :returns: A predicate for containing any of the strings
+    """
+
+    strings = list(strings)
+    for string in strings:
+        if len(string) != 2:
+            raise ValueError(
+                f"Forbidden strings must be two letters long, "
+                f"not {string!r}."
+            )
+    return Predicate(
+        f"any of {', '.join(strings)}", _check_forbidden, (frozenset(strings),)
+    )
+
+
+def repeated_pair() -> Predicate:
+    """
+    :returns:
+        A predicate for containing a pair of letters twice without
+        overlapping, like xyxy
+    """
+
+    return Predicate("a pair twice without overlapping", _check_repeated_pair)
+
+
+def split_repeat() -> Predicate:
+    """
+    :returns:
+        A predicate for containing a letter which repeats with exactly
+        one letter between, like xyx
+    """
+
+    return Predicate(
+        "a letter repeated with one letter between", _check_split_repeat
+    )
+
+
+# A string is nice when every predicate of a rule set has the given result
+RULE_SETS = {
+    1: [
+        (vowels(3), True),
+        (doubled_letter(), True),
+        (forbidden(["ab", "cd", "pq", "xy"]), False),
+    ],
+    2: [
+        (repeated_pair(), True),
+        (split_repeat(), True),
+    ],
+}
+
+
+class RuleEngine:
+    """
+    A class for counting the strings that follow each of many rule sets.
+
+    Every distinct predicate used by any rule set is checked in a single
+    pass over each string, with each character sent to the check of every
+    predicate in turn. The rule sets are then checked against the results,
+    so adding rule sets does not add passes over the strings, and only
+    adds the per character work of the predicates no other rule set uses.
+    """
+
+    def __init__(self, rule_sets: dict[int | str, list[tuple]]) -> None:
+        """
+        :param rule_sets:
+            A dict mapping the name of each rule set to a list of
+            (Predicate, result) tuples, all of which must hold
+        """
+
+        predicates = []
+        for rules in rule_sets.values():
+            for predicate, _ in rules:
+                if predicate not in predicates:
+                    predicates.append(predicate)
+
+        self.names = list(rule_sets)
+        self.predicates = predicates
+        self._requirements = {
+            name: [
+                (predicates.index(predicate), result)
+                for predicate, result in rules
+            ]
+            for name, rules in rule_sets.items()
+        }
+
+    def _signature(self, string: str) -> tuple[bool, ...]:
+        """
+        Check every predicate against a string in a single pass
+
+        :param string: The string to check
+        :returns: The result of each predicate, in order
+        """
+
+        checks = [
+            predicate.check(*predicate.arguments)
+            for predicate in self.predicates
+        ]
+        for check in checks:
+            next(check)
+        sends = [check.send for check in checks]
+        for char in string:
+            for send in sends:
+                send(char)
+
+        return tuple(send(None) for send in sends)
+
+    def count(self, strings: list[str]) -> dict[int | str, int]:
+        """
+        Count the strings that follow each rule set
+
+        :param strings: The strings to classify
+        :returns: A dict mapping each rule set to its number of strings
+        """
+
+        # Strings with the same predicate results follow the same rule sets
+        signatures = collections.Counter(map(self._signature, strings))
+
+        return {
+            name: sum(
+                count
+                for signature, count in signatures.items()
+                if all(
+                    signature[index] == result
+                    for index, result in requirements
+                )
+            )
+            for name, requirements in self._requirements.items()
+        }
+
+
+def _count_all_nice(
+    puzzle: Iterable[str],
+    engine: RuleEngine,
+    workers: int = 1,
+) -> dict[int | str, int]:
+    """
+    Count the strings in the input that follow each rule set.
+
+    Inputs of more than one chunk can be classified by worker processes.
+
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
+    :param engine: The rule sets to check
+    :param workers: The number of worker processes to use for large inputs
+    :returns: A dict mapping each rule set to its number of strings
+    """
+
+    strings = chunks(puzzle, CHUNK_SIZE)
+    first = next(strings, [])
+    strings = itertools.chain([first], strings)
+    if workers == 1 or len(first) < CHUNK_SIZE:
+        counts = map(engine.count, strings)
+    else:
+        counts = parallel_map(engine.count, strings, workers)
+
+    totals = collections.Counter()
+    for chunk_counts in counts:
+        totals.update(chunk_counts)
+
+    return {name: totals[name] for name in engine.names}
+
+
+def solve(
+    puzzle: Iterable[str], part: int | None = None, workers: int = 1
+) -> list[Result]:
     """
     Solve the 2015 Day 5 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :param workers: the number of worker processes to use for large inputs
+    :returns: the answers to the solved parts of the puzzle
     """
 
-    BAD_STRINGS = {"ab", "cd", "pq", "xy"}
-    VOWELS = {"a", "e", "i", "o", "u"}
-
-    # We can solve both parts in a single loop over the input,
-    # and with a single pass over each string
-    num_nice_strings_1 = 0
-    num_nice_strings_2 = 0
-    for string in puzzle:
-        # Part 1 parameters
-        bad_string_found = False
-        double_found = False
-        num_vowels = 0
-        # Part 2 parameters
-        pair_found = False
-        pairs_seen = set()
-        previous_pair = None
-        split_repeat_found = False
-
-        previous_char = None
-        for char in string:
-            if char in VOWELS:
-                num_vowels = num_vowels + 1
-
-            if previous_char is not None:
-                if previous_char == char:
-                    double_found = True
-                if previous_char + char in BAD_STRINGS:
-                    bad_string_found = True
-
-                current_pair = previous_char + char
-                if previous_pair is not None:
-                    if (
-                        current_pair != previous_pair
-                        and current_pair in pairs_seen
-                    ):
-                        pair_found = True
-                    if char == previous_pair[0]:
-                        split_repeat_found = True
-                previous_pair = previous_char + char
-                pairs_seen.add(current_pair)
-            previous_char = char
-
-        if not bad_string_found and num_vowels >= 3 and double_found:
-            num_nice_strings_1 = num_nice_strings_1 + 1
-        if pair_found and split_repeat_found:
-            num_nice_strings_2 = num_nice_strings_2 + 1
+    stopwatch = Stopwatch()
+    results = []
+
+    num_nice_strings = _count_all_nice(
+        puzzle, RuleEngine(RULE_SETS), workers
+    )
+    num_nice_strings_1 = num_nice_strings[1]
+    num_nice_strings_2 = num_nice_strings[2]
 
     if part == 1 or part is None:
-        print(f"Part 1: The number of nice strings is {num_nice_strings_1}.")
+        message = (
+            f"Part 1: The number of nice strings is "
+            f"{num_nice_strings_1}."
+        )
+        results.append(stopwatch.result(1, num_nice_strings_1, message))
     if part == 2 or part is None:
-        print(f"Part 2: The number of nice strings is {num_nice_strings_2}.")
+        message = (
+            f"Part 2: The number of nice strings is "
+            f"{num_nice_strings_2}."
+        )
+        results.append(stopwatch.result(2, num_nice_strings_2, message))
+
+    return results
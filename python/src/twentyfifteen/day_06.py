@@ -4,6 +4,9 @@ Advent of Code 2015 Day 6
 The puzzle contains a series of instructions for setting the state
 of lights in a 1000 x 1000 grid.
 
+Grids of any size are supported by compressing the coordinates of the grid
+down to the blocks of lights that are always updated together.
+
 Part 1
 ------
 How many lights are on?
@@ -13,37 +16,38 @@ Part 2
 What is the total brightness?
 """
 
+import itertools
+import operator
 import re
+import sys
+from array import array
+
+from solution import Result, Stopwatch
+
+# Swaps the on (1) and off (0) states of a row of lights
+TOGGLE = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+# The array typecodes to try for the brightness of each light, smallest first
+FIELD_TYPECODES = ["B", "H", "I", "L", "Q"]
 
 
-def _solve_part(puzzle: list[str], part: int) -> int:
+def _parse(puzzle: list[str]) -> list[tuple[str, int, int, int, int]]:
     """
-    Each part essentially does the same thing, except uses different rules
-    to update the grid, so this function uses the input part number to
-    decide on the rules
+    Parse the instructions for setting the lights
 
     :param puzzle: the contents of the puzzle file
-    :param part: which part to solve
-    :returns: the solution to the part in question
+    :returns:
+        A list of (command, i_start, j_start, i_end, j_end) tuples,
+        where the indices are inclusive
     """
 
-    if part not in {1, 2}:
-        raise ValueError(
-            f"The part number must be either 1 or 2, not {part}"
-        )
-
-    GRID_DIMENSIONS = (1000, 1000)
-    # All lights start off, which is represented by a value of zero
-    grid = {
-        (i, j): 0
-        for i in range(GRID_DIMENSIONS[0])
-        for j in range(GRID_DIMENSIONS[1])
-    }
-
     REGEX = (
-        r"(?P<command>[a-z|\s]*) (?P<indices_start>[0-9]{1,3},[0-9]{1,3}) "
-        r"through (?P<indices_end>[0-9]{1,3},[0-9]{1,3})"
+        r"(?P<command>[a-z|\s]*) (?P<indices_start>[0-9]+,[0-9]+) "
+        r"through (?P<indices_end>[0-9]+,[0-9]+)"
     )
+    COMMANDS = {"turn off", "turn on", "toggle"}
+
+    instructions = []
     for line in puzzle:
         rmatch = re.match(REGEX, line)
         if rmatch is None:
@@ -52,62 +56,216 @@ def _solve_part(puzzle: list[str], part: int) -> int:
             )
 
         command = rmatch.group("command")
+        if command not in COMMANDS:
+            raise ValueError(
+                f"Found an unexpected command. The command should be one "
+                f"of 'turn off', 'turn on', or 'toggle', not '{command}'."
+            )
         indices_start = [
             int(value) for value in rmatch.group("indices_start").split(",")
         ]
         indices_end = [
             int(value) for value in rmatch.group("indices_end").split(",")
         ]
+        instructions.append((command, *indices_start, *indices_end))
+
+    return instructions
+
+
+def _compress(
+    instructions: list[tuple[str, int, int, int, int]],
+) -> tuple[list[tuple[str, int, int, int, int]], list[int], list[int]]:
+    """
+    Compress the coordinates of the grid to the blocks of lights that
+    are always updated together.
+
+    Every instruction rectangle starts and ends on the boundaries between
+    blocks, so all the lights within a block always share the same state.
+    Lights outside of every rectangle are never turned on,
+    so they are left out.
+
+    :param instructions: the parsed instructions
+    :returns:
+        The instructions in terms of block indices,
+        and the heights of the rows and the widths of the columns of blocks
+    """
+
+    # The boundaries are the first index within and past each rectangle
+    row_bounds = set()
+    col_bounds = set()
+    for _, i_start, j_start, i_end, j_end in instructions:
+        row_bounds.update((i_start, i_end + 1))
+        col_bounds.update((j_start, j_end + 1))
+    row_bounds = sorted(row_bounds)
+    col_bounds = sorted(col_bounds)
+    row_index = {i: index for index, i in enumerate(row_bounds)}
+    col_index = {j: index for index, j in enumerate(col_bounds)}
+
+    compressed = [
+        (
+            command,
+            row_index[i_start],
+            col_index[j_start],
+            row_index[i_end + 1] - 1,
+            col_index[j_end + 1] - 1,
+        )
+        for command, i_start, j_start, i_end, j_end in instructions
+    ]
+    heights = [end - start for start, end in zip(row_bounds, row_bounds[1:])]
+    widths = [end - start for start, end in zip(col_bounds, col_bounds[1:])]
+
+    return compressed, heights, widths
+
+
+def _light_grid(
+    instructions: list[tuple[str, int, int, int, int]],
+    dimensions: tuple[int, int],
+    sizes: tuple[list[int], list[int]] | None = None,
+) -> tuple[int, int]:
+    """
+    Follow the instructions under the rules of both parts at once.
+
+    Each row of the grid is stored as a compact buffer: a bytearray of
+    on/off states for part 1, and a single integer holding the brightness
+    of every entry in a field of the same number of bits for part 2.
+    Every instruction updates a whole slice of each row it covers with a
+    few operations on whole buffers, rather than one entry at a time,
+    but the total cost still grows with the number of instructions times
+    the number of entries they cover. For compressed grids of n random
+    instructions, that is around n**3 field updates, done by
+    n**2 integer operations on rows of around n fields.
 
+    :param instructions: the parsed instructions
+    :param dimensions: the number of rows and columns of lights
+    :param sizes:
+        The heights of the rows and the widths of the columns,
+        if each entry of the grid is a block of lights from _compress.
+        If None, each entry of the grid is a single light.
+    :returns: the number of lights that are on, and the total brightness
+    """
+
+    num_rows, num_cols = dimensions
+    # All lights start off, which is represented by a value of zero
+    states = [bytearray(num_cols) for _ in range(num_rows)]
+    brightnesses = [0] * num_rows
+
+    ON = b"\x01" * num_cols
+    OFF = bytes(num_cols)
+
+    # A brightness can never exceed twice the number of instructions,
+    # so it always fits below the top bit of its field
+    typecode = next(
+        typecode
+        for typecode in FIELD_TYPECODES
+        if 2 * len(instructions) < 1 << (8 * array(typecode).itemsize - 1)
+    )
+    bits = 8 * array(typecode).itemsize
+    # A 1 in every field, and the largest value below the top bit of
+    # every field, which carries into the top bit of any nonzero field
+    ones = ((1 << bits * num_cols) - 1) // ((1 << bits) - 1)
+    nonzero = ones * ((1 << (bits - 1)) - 1)
+
+    for command, i_start, j_start, i_end, j_end in instructions:
         # Indices are inclusive, so ranges run to end + 1
+        columns = slice(j_start, j_end + 1)
+        width = j_end + 1 - j_start
+        # A 1 in the field of every column of the instruction
+        mask = (ones >> bits * (num_cols - width)) << bits * j_start
+        rows = range(i_start, i_end + 1)
         match command:
             case "turn off":
-                for i in range(indices_start[0], indices_end[0] + 1):
-                    for j in range(indices_start[1], indices_end[1] + 1):
-                        if part == 1:
-                            grid[(i, j)] = 0
-                        elif part == 2:
-                            grid[(i, j)] = grid[(i, j)] - 1
-                            if grid[(i, j)] < 0:
-                                grid[(i, j)] = 0
+                for i in rows:
+                    states[i][columns] = OFF[:width]
+                    # Brightness never drops below zero, so only lights
+                    # with a nonzero brightness are turned down
+                    brightness = brightnesses[i]
+                    brightnesses[i] = brightness - (
+                        (brightness + nonzero) >> (bits - 1) & mask
+                    )
             case "turn on":
-                for i in range(indices_start[0], indices_end[0] + 1):
-                    for j in range(indices_start[1], indices_end[1] + 1):
-                        if part == 1:
-                            grid[(i, j)] = 1
-                        elif part == 2:
-                            grid[(i, j)] = grid[(i, j)] + 1
+                for i in rows:
+                    states[i][columns] = ON[:width]
+                    brightnesses[i] = brightnesses[i] + mask
             case "toggle":
-                for i in range(indices_start[0], indices_end[0] + 1):
-                    for j in range(indices_start[1], indices_end[1] + 1):
-                        if part == 1:
-                            grid[(i, j)] = grid[(i, j)] ^ 1  # XOR
-                        elif part == 2:
-                            grid[(i, j)] = grid[(i, j)] + 2
-            case _:
-                raise ValueError(
-                    f"Found an unexpected command. The command should be one "
-                    f"of 'turn off', 'turn on', or 'toggle', not '{command}'."
-                )
-
-    return sum(value for value in grid.values())
-
-
-def solve(puzzle: list[str], part: int | None = None) -> None:
+                mask = mask << 1
+                for i in rows:
+                    state = states[i]
+                    state[columns] = state[columns].translate(TOGGLE)
+                    brightnesses[i] = brightnesses[i] + mask
+
+    # Unpack the fields of each row of brightnesses
+    brightnesses = (
+        array(typecode, brightness.to_bytes(bits // 8 * num_cols, "little"))
+        for brightness in brightnesses
+    )
+    if sys.byteorder == "big":
+        brightnesses = map(_byteswap, brightnesses)
+
+    if sizes is None:
+        lights_on = sum(sum(state) for state in states)
+        total_brightness = sum(sum(brightness) for brightness in brightnesses)
+        return lights_on, total_brightness
+
+    heights, widths = sizes
+    lights_on = 0
+    total_brightness = 0
+    for height, state, brightness in zip(heights, states, brightnesses):
+        lights_on = lights_on + height * sum(itertools.compress(widths, state))
+        total_brightness = total_brightness + height * sum(
+            map(operator.mul, brightness, widths)
+        )
+    return lights_on, total_brightness
+
+
+def _byteswap(fields: array) -> array:
+    """
+    :param fields: An array read from little-endian bytes
+    :returns: The same array, converted to the native byte order
+    """
+
+    fields.byteswap()
+    return fields
+
+
+def solve(puzzle: list[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2015 Day 6 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
+    GRID_DIMENSIONS = (1000, 1000)
+    GRID_AREA = GRID_DIMENSIONS[0] * GRID_DIMENSIONS[1]
+    instructions = _parse(puzzle)
+
+    # Both parts follow the same instructions, so they are solved together.
+    # The full grid is only used when it is smaller than the compressed grid,
+    # which is never the case for instructions on larger grids
+    compressed, heights, widths = _compress(instructions)
+    fits_grid = all(
+        i_end < GRID_DIMENSIONS[0] and j_end < GRID_DIMENSIONS[1]
+        for _, _, _, i_end, j_end in instructions
+    )
+    if fits_grid and len(heights) * len(widths) >= GRID_AREA:
+        lights_on, brightness = _light_grid(instructions, GRID_DIMENSIONS)
+    else:
+        lights_on, brightness = _light_grid(
+            compressed, (len(heights), len(widths)), sizes=(heights, widths)
+        )
+
     if part == 1 or part is None:
-        print(
+        message = (
             f"Part 1: The total number of lights that are on is: "
-            f"{_solve_part(puzzle, 1)}."
+            f"{lights_on}."
         )
+        results.append(stopwatch.result(1, lights_on, message))
     if part == 2 or part is None:
-        print(
-            f"Part 2: The total brightness is: {_solve_part(puzzle, 2)}."
-        )
+        message = f"Part 2: The total brightness is: {brightness}."
+        results.append(stopwatch.result(2, brightness, message))
 
+    return results
@@ -13,145 +13,456 @@ Reset all wires, set wire b to now be the value of wire a from part 1,
 and then recalculate all wires. What signal does wire a have now?
 """
 
-def _route_wires(wires: dict[str, str], wire: str) -> None:
+from collections.abc import Iterable
+
+from solution import Result, Stopwatch
+
+# The operations that can provide a signal to a wire
+SIGNAL, ASSIGN, NOT, AND, OR, LSHIFT, RSHIFT = range(7)
+BINARY_OPERATIONS = {"AND": AND, "OR": OR, "LSHIFT": LSHIFT, "RSHIFT": RSHIFT}
+
+# Signals are unsigned 16-bit integers
+MASK = 0xFFFF
+
+
+class Circuit:
     """
-    Recursively iterate through all wires until everything has a set value.
+    A class representing a circuit of wires and gates.
 
-    For consistency between cases where a wire hasn't been fully resolved,
-    and thus has some string value (either a command or a reference to another
-    wire), I leave resolved numerical values as strings, but convert them
-    to integers for computations.
+    The instructions are parsed once into a list of nodes, one per wire,
+    where each node has an operation and the indices of its source nodes.
+    Numbers used as sources are given nodes of their own, named after the
+    number. The nodes are sorted so that every node comes after its sources,
+    so the whole circuit is evaluated in a single loop, without recursion.
 
-    :param wires: The dict mapping wire inputs and outputs
-    :param wire: The wire to set within wires
+    Once the circuit has been evaluated, setting the signal of a wire only
+    re-evaluates the wires downstream of it.
+
+    Many signals can be tried for some wires at once with evaluate_batch().
+    Each wire downstream of them is then held as 16 bit planes, one per bit
+    of its signal, where each plane is an integer with one bit per signal
+    being tried, so every gate handles the whole batch with a few operations
+    on Python integers.
     """
 
-    if wire.lstrip("-").isdigit():
-        return
+    def __init__(self, instructions: Iterable[str]) -> None:
+        self.names = []
+        self._indices = dict()
+        self._operations = []
+        self._sources = []
+        self._signals = []
+
+        for instruction in instructions:
+            components = [
+                component.strip() for component in instruction.split("->")
+            ]
+            if len(components) != 2:
+                raise ValueError(
+                    f"Found an unexpected instruction. "
+                    f"The instruction is: {instruction}"
+                )
+            self._add_gate(components[1], components[0])
+
+        for index, name in enumerate(self.names):
+            if self._operations[index] is None:
+                raise ValueError(f"Wire {name} is never given a signal.")
+
+        self._dependents = [[] for _ in self.names]
+        for index, sources in enumerate(self._sources):
+            for source in set(sources):
+                self._dependents[source].append(index)
+        self._order = self._sort()
+        self._positions = [0] * len(self.names)
+        for position, index in enumerate(self._order):
+            self._positions[index] = position
+
+        self.values = [0] * len(self.names)
+        self._evaluated = False
 
-    signal = wires[wire]
-    components = [component.strip() for component in signal.split()]
+    def _node(self, name: str) -> int:
+        """
+        Find the index of the node for a wire or a number,
+        adding the node if it doesn't exist yet
 
-    # This should be a direct assignment, like 1 -> a or b -> a
-    if len(components) == 1:
-        source = components[0]
-        _route_wires(wires, source)
+        :param name: The name of the wire, or a number
+        :returns: The index of the node
+        """
 
-        if source.lstrip("-").isdigit():
-            wires[wire] = source
-        elif wires[source].isdigit():
-            wires[wire] = wires[source]
-        return
+        index = self._indices.get(name)
+        if index is not None:
+            return index
 
-    if len(components) == 2:
-        if "NOT" not in components:
+        index = len(self.names)
+        self._indices[name] = index
+        self.names.append(name)
+        self._sources.append(())
+        if name.lstrip("-").isdigit():
+            self._operations.append(SIGNAL)
+            self._signals.append(int(name) & MASK)
+        else:
+            # Set once the instruction for the wire is found
+            self._operations.append(None)
+            self._signals.append(0)
+        return index
+
+    def _add_gate(self, wire: str, signal: str) -> None:
+        """
+        Add the gate that provides a signal to a wire
+
+        :param wire: The wire receiving the signal
+        :param signal: The left hand side of the instruction, e.g. "x AND y"
+        """
+
+        components = signal.split()
+        index = self._node(wire)
+        if self._operations[index] is not None:
+            raise ValueError(f"Wire {wire} is given more than one signal.")
+
+        # This should be a direct assignment, like 1 -> a or b -> a
+        if len(components) == 1:
+            source = components[0]
+            if source.lstrip("-").isdigit():
+                self._operations[index] = SIGNAL
+                self._signals[index] = int(source) & MASK
+            else:
+                self._operations[index] = ASSIGN
+                self._sources[index] = (self._node(source),)
+        elif len(components) == 2:
+            if components[0] != "NOT":
+                raise ValueError(
+                    f"Found unsupported unary operation. "
+                    f"The input command is: {signal}."
+                )
+            self._operations[index] = NOT
+            self._sources[index] = (self._node(components[1]),)
+        elif len(components) == 3:
+            operation = BINARY_OPERATIONS.get(components[1])
+            if operation is None:
+                raise ValueError(
+                    f"Found unsupported binary operation. "
+                    f"The input command is: {signal}."
+                )
+            self._operations[index] = operation
+            self._sources[index] = (
+                self._node(components[0]),
+                self._node(components[2]),
+            )
+        else:
             raise ValueError(
-                f"Found unsupported unary operation. "
+                f"Reached unexpected state. Please check the command format."
                 f"The input command is: {signal}."
             )
-        source = components[1]
-        _route_wires(wires, source)
 
-        if source.lstrip("-").isdigit():
-            value = int(source)
-        else:
-            value = int(wires[source])
-        wires[wire] = str(~value)
-        return
-
-    if len(components) == 3:
-        if not (
-            "AND" in components
-            or "OR" in components
-            or "LSHIFT" in components
-            or "RSHIFT" in components
-        ):
+    def _sort(self) -> list[int]:
+        """
+        Sort the nodes so that every node comes after its sources,
+        using Kahn's algorithm
+
+        :returns: The indices of the nodes in evaluation order
+        """
+
+        num_sources = [len(set(sources)) for sources in self._sources]
+        dependents = self._dependents
+        order = [
+            index for index, count in enumerate(num_sources) if count == 0
+        ]
+        # The order list doubles as the queue of nodes ready to evaluate
+        for index in order:
+            for dependent in dependents[index]:
+                num_sources[dependent] = num_sources[dependent] - 1
+                if num_sources[dependent] == 0:
+                    order.append(dependent)
+
+        if len(order) != len(self.names):
+            raise ValueError("The circuit contains a loop.")
+        return order
+
+    def _downstream(self, index: int) -> list[int]:
+        """
+        Find a node and every node that depends on it, directly or not
+
+        :param index: The index of the node
+        :returns: The indices of the nodes, in evaluation order
+        """
+
+        cone = {index}
+        stack = [index]
+        while stack:
+            for dependent in self._dependents[stack.pop()]:
+                if dependent not in cone:
+                    cone.add(dependent)
+                    stack.append(dependent)
+
+        return sorted(cone, key=self._positions.__getitem__)
+
+    def set_signal(self, wire: str, value: int) -> None:
+        """
+        Replace the gate of a wire with a fixed signal.
+
+        If the circuit has already been evaluated, only the wire and the wires
+        downstream of it are re-evaluated.
+
+        :param wire: The wire to set
+        :param value: The signal to provide to the wire
+        """
+
+        index = self._indices[wire]
+        # The wire no longer depends on its sources, which can only remove
+        # constraints on the evaluation order, so the order stays valid
+        for source in set(self._sources[index]):
+            self._dependents[source].remove(index)
+        self._operations[index] = SIGNAL
+        self._sources[index] = ()
+        self._signals[index] = value & MASK
+
+        if self._evaluated:
+            self._evaluate(self._downstream(index))
+
+    def evaluate(self) -> None:
+        """
+        Find the signal on every wire of the circuit
+        """
+
+        self._evaluate(self._order)
+        self._evaluated = True
+
+    def _evaluate(self, order: list[int]) -> None:
+        """
+        Find the signals on some of the wires of the circuit
+
+        :param order:
+            The indices of the nodes to evaluate, in evaluation order.
+            The sources of every node must be in the list or up to date.
+        """
+
+        operations = self._operations
+        sources = self._sources
+        signals = self._signals
+        values = self.values
+        for index in order:
+            operation = operations[index]
+            if operation == SIGNAL:
+                values[index] = signals[index]
+            elif operation == ASSIGN:
+                values[index] = values[sources[index][0]]
+            elif operation == NOT:
+                values[index] = ~values[sources[index][0]] & MASK
+            else:
+                source_1, source_2 = sources[index]
+                if operation == AND:
+                    values[index] = values[source_1] & values[source_2]
+                elif operation == OR:
+                    values[index] = values[source_1] | values[source_2]
+                elif operation == LSHIFT:
+                    values[index] = (
+                        values[source_1] << values[source_2] & MASK
+                    )
+                else:
+                    values[index] = values[source_1] >> values[source_2]
+
+    def evaluate_batch(
+        self, inputs: dict[str, list[int]], outputs: Iterable[str]
+    ) -> dict[str, list[int]]:
+        """
+        Find the signals on some wires for many sets of signals on other wires
+
+        :param inputs:
+            A dict mapping each wire to set to the list of signals to try,
+            where every list has the same length, and the nth signals of every
+            list are tried together, in place of the gates of the wires
+        :param outputs: The wires to find the signals of
+        :returns:
+            A dict mapping each output wire to the list of its signals,
+            one for each set of signals tried
+        """
+
+        sizes = {len(values) for values in inputs.values()}
+        if len(sizes) != 1:
             raise ValueError(
-                f"Found unsupported binary operation. "
-                f"The input command is: {signal}."
+                "Every input wire must be given the same number of signals."
             )
-        source_1 = components[0]
-        _route_wires(wires, source_1)
-        source_2 = components[2]
-        _route_wires(wires, source_2)
+        size = sizes.pop()
+        ones = (1 << size) - 1
 
-        if source_1.lstrip("-").isdigit():
-            value_1 = int(source_1)
-        else:
-            value_1 = int(wires[source_1])
-        if source_2.lstrip("-").isdigit():
-            value_2 = int(source_2)
-        else:
-            value_2 = int(wires[source_2])
-
-        operator = components[1]
-        match operator:
-            case "AND":
-                wires[wire] = str(value_1 & value_2)
-            case "OR":
-                wires[wire] = str(value_1 | value_2)
-            case "LSHIFT":
-                wires[wire] = str(value_1 << value_2)
-            case "RSHIFT":
-                wires[wire] = str(value_1 >> value_2)
-            case _:
-                raise ValueError(f"Received unsupported operator: {operator}.")
-        return
-
-    else:
-        raise ValueError(
-            f"Reached unexpected state. Please check the command format."
-            f"The input command is: {signal}."
-        )
-
-
-def _to_uint16(integer: int|str) -> int:
+        if not self._evaluated:
+            self.evaluate()
+
+        # Only the wires downstream of the inputs vary across the batch
+        cone = set()
+        for wire in inputs:
+            cone.update(self._downstream(self._indices[wire]))
+        order = sorted(cone, key=self._positions.__getitem__)
+        output_indices = {self._indices[wire] for wire in outputs}
+
+        # Each plane is only kept until the last wire using it is evaluated
+        remaining = {index: len(self._dependents[index]) for index in cone}
+        input_planes = {
+            self._indices[wire]: _to_planes(values)
+            for wire, values in inputs.items()
+        }
+        planes = dict()
+
+        def _source_planes(source: int) -> tuple[int, ...]:
+            if source in planes:
+                return planes[source]
+            return _constant_planes(self.values[source], ones)
+
+        for index in order:
+            operation = self._operations[index]
+            sources = [
+                _source_planes(source) for source in self._sources[index]
+            ]
+            if index in input_planes:
+                result = input_planes[index]
+            elif operation == SIGNAL:
+                result = _constant_planes(self._signals[index], ones)
+            elif operation == ASSIGN:
+                result = sources[0]
+            elif operation == NOT:
+                result = tuple(plane ^ ones for plane in sources[0])
+            elif operation == AND:
+                result = tuple(map(int.__and__, *sources))
+            elif operation == OR:
+                result = tuple(map(int.__or__, *sources))
+            else:
+                result = _shift_planes(*sources, operation == LSHIFT, ones)
+            planes[index] = result
+
+            for source in set(self._sources[index]):
+                if source in remaining:
+                    remaining[source] = remaining[source] - 1
+                    if remaining[source] == 0 and source not in output_indices:
+                        del planes[source]
+
+        results = dict()
+        for wire in outputs:
+            index = self._indices[wire]
+            if index in planes:
+                results[wire] = _from_planes(planes[index], size)
+            else:
+                results[wire] = [self.values[index]] * size
+        return results
+
+    def __getitem__(self, wire: str) -> int:
+        """
+        Get the signal on a wire, as of the last evaluation
+
+        :param wire: The wire to get
+        :returns: The signal on the wire
+        """
+
+        return self.values[self._indices[wire]]
+
+
+def _constant_planes(value: int, ones: int) -> tuple[int, ...]:
+    """
+    Find the bit planes of a signal that is the same across a batch
+
+    :param value: The signal
+    :param ones: The plane with a bit set for every signal in the batch
+    :returns: The 16 bit planes of the signal, least significant first
+    """
+
+    return tuple(ones if value >> bit & 1 else 0 for bit in range(16))
+
+
+def _to_planes(values: list[int]) -> tuple[int, ...]:
+    """
+    Find the bit planes of a batch of signals
+
+    :param values: The signals
+    :returns:
+        The 16 bit planes of the signals, least significant first,
+        where bit n of each plane belongs to the nth signal
+    """
+
+    # Each column holds one bit of every signal, most significant bit first
+    columns = zip(*(f"{value & MASK:016b}" for value in reversed(values)))
+    return tuple(int("".join(column), 2) for column in columns)[::-1]
+
+
+def _from_planes(planes: tuple[int, ...], size: int) -> list[int]:
     """
-    Change the representation of an integer to be an unsigned 16-bit integer
+    Find a batch of signals from their bit planes
 
-    :param integer: The integer to change to uint16
-    :returns: The uint16 representation of the input integer
+    :param planes: The 16 bit planes of the signals, least significant first
+    :param size: The number of signals in the batch
+    :returns: The signals
     """
 
-    if not isinstance(integer, int) and not isinstance(integer, str):
-        raise ValueError(
-            f"Cannot meaningfully cast data of type {type(integer)} "
-            f"to uint16."
-        )
+    # Each row holds every bit of one signal, from the last signal to the first
+    rows = zip(*(f"{plane:0{size}b}" for plane in reversed(planes)))
+    return [int("".join(row), 2) for row in rows][::-1]
 
-    value = int(integer)
-    if value < 0:
-        value = 2**16 - value
-    return value
 
+def _shift_planes(
+    planes: tuple[int, ...],
+    amounts: tuple[int, ...],
+    left: bool,
+    ones: int,
+) -> tuple[int, ...]:
+    """
+    Shift a batch of signals by a batch of amounts
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+    :param planes: The 16 bit planes of the signals to shift
+    :param amounts: The 16 bit planes of the amounts to shift by
+    :param left: Whether to shift left, rather than right
+    :param ones: The plane with a bit set for every signal in the batch
+    :returns: The 16 bit planes of the shifted signals
+    """
+
+    def _shift(planes: tuple[int, ...], amount: int) -> tuple[int, ...]:
+        amount = min(amount, 16)
+        if left:
+            return (0,) * amount + planes[: 16 - amount]
+        return planes[amount:] + (0,) * amount
+
+    # Shifting every signal by the same amount only reorders the planes
+    if all(plane == 0 or plane == ones for plane in amounts):
+        amount = sum(1 << bit for bit, plane in enumerate(amounts) if plane)
+        return _shift(planes, amount)
+
+    # Otherwise, shift by each power of 2 for the signals with that bit set
+    for bit, mask in enumerate(amounts[:4]):
+        if mask:
+            shifted = _shift(planes, 1 << bit)
+            planes = tuple(
+                shifted_plane & mask | plane & ~mask
+                for shifted_plane, plane in zip(shifted, planes)
+            )
+    # Any shift by 16 or more clears the signal
+    overflow = 0
+    for mask in amounts[4:]:
+        overflow = overflow | mask
+    return tuple(plane & ~overflow for plane in planes)
+
+
+def solve(puzzle: list[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2015 Day 7 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
-    wires_1 = dict()
-    wires_2 = dict()
-    for line in puzzle:
-        components = [component.strip() for component in line.split("->")]
-        if len(components) != 2:
-            raise ValueError(
-                f"Found an unexpected instruction. The instruction is: {line}"
-            )
-        wires_1[components[1]] = components[0]
-        wires_2[components[1]] = components[0]
+    stopwatch = Stopwatch()
+    results = []
+
+    circuit = Circuit(puzzle)
 
     # Both parts require solving part 1
-    _route_wires(wires_1, "a")
-    value = _to_uint16(wires_1["a"])
+    circuit.evaluate()
+    value = circuit["a"]
     if part == 1 or part is None:
-        print(f"Part 1: The value of wire 'a' is: {value}.")
+        message = f"Part 1: The value of wire 'a' is: {value}."
+        results.append(stopwatch.result(1, value, message))
 
     if part == 2 or part is None:
-        wires_2["b"] = wires_1["a"]
-        _route_wires(wires_2, "a")
-        value = _to_uint16(wires_2["a"])
-        print(f"Part 2: The value of wire 'a' is now: {value}.")
+        # Only the wires downstream of wire b need to be re-evaluated
+        circuit.set_signal("b", value)
+        value = circuit["a"]
+        message = f"Part 2: The value of wire 'a' is now: {value}."
+        results.append(stopwatch.result(2, value, message))
+
+    return results
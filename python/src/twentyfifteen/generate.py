@@ -0,0 +1,248 @@
+"""
+Advent of Code 2015 - Input Generators
+
+Each generator produces a valid puzzle input of an arbitrary size for one day,
+so that the solutions can be tested on inputs much larger than the real ones.
+The same size and seed always produce the same input.
+
+Generators yield the input as chunks of text, including the line endings,
+so that very large inputs can be written out without being held in memory.
+"""
+
+import random
+import string
+from collections.abc import Iterator
+
+# The number of characters to yield at once for single line inputs
+CHUNK_SIZE = 1 << 16
+
+
+def _single_line(
+    rng: random.Random, alphabet: str, size: int
+) -> Iterator[str]:
+    """
+    Generate a single line of random characters, in chunks
+
+    :param rng: The random number generator to use
+    :param alphabet: The characters to choose from
+    :param size: The number of characters on the line
+    :returns: An iterator over chunks of the line
+    """
+
+    remaining = size
+    while remaining > 0:
+        length = min(remaining, CHUNK_SIZE)
+        yield "".join(rng.choices(alphabet, k=length))
+        remaining = remaining - length
+    yield "\n"
+
+
+def day_01(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2015 Day 1 input
+
+    :param size: The number of "(" and ")" characters
+    :param seed: The seed for the random number generator
+    :returns: An iterator over chunks of the input
+    """
+
+    rng = random.Random(seed)
+    yield from _single_line(rng, "()", size)
+
+
+def day_02(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2015 Day 2 input
+
+    :param size: The number of LxWxH boxes
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    for _ in range(size):
+        length, width, height = (rng.randint(1, 30) for _ in range(3))
+        yield f"{length}x{width}x{height}\n"
+
+
+def day_03(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2015 Day 3 input
+
+    :param size: The number of moves
+    :param seed: The seed for the random number generator
+    :returns: An iterator over chunks of the input
+    """
+
+    rng = random.Random(seed)
+    yield from _single_line(rng, "<>^v", size)
+
+
+def day_04(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2015 Day 4 input
+
+    The difficulty of this puzzle does not depend on the length of the key,
+    only on the number of leading zeros required.
+
+    :param size: The number of characters in the secret key
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    yield "".join(rng.choices(string.ascii_lowercase, k=size)) + "\n"
+
+
+def day_05(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2015 Day 5 input
+
+    :param size: The number of strings
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield "".join(rng.choices(string.ascii_lowercase, k=16)) + "\n"
+
+
+def day_06(size: int, seed: int = 0, grid: int = 1000) -> Iterator[str]:
+    """
+    Generate a 2015 Day 6 input
+
+    :param size: The number of instructions
+    :param seed: The seed for the random number generator
+    :param grid: The width and height of the grid of lights
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    commands = ["turn on", "turn off", "toggle"]
+    for _ in range(size):
+        command = rng.choice(commands)
+        x_start, x_end = sorted(rng.randrange(grid) for _ in range(2))
+        y_start, y_end = sorted(rng.randrange(grid) for _ in range(2))
+        yield (
+            f"{command} {x_start},{y_start} through {x_end},{y_end}\n"
+        )
+
+
+def _wire_name(index: int) -> str:
+    """
+    Generate a unique lowercase wire name for a non-negative index,
+    never producing the names "a" or "b", which have special meanings
+
+    :param index: The index of the wire
+    :returns: The name of the wire
+    """
+
+    # Bijective base 26, offset so that the single letters a and b are skipped
+    index = index + 2
+    name = ""
+    while True:
+        index, remainder = divmod(index, 26)
+        name = string.ascii_lowercase[remainder] + name
+        if index == 0:
+            return name
+        index = index - 1
+
+
+def day_07(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2015 Day 7 input
+
+    Gates mostly take their inputs from recently defined wires,
+    so the circuit contains long dependency chains, like the real input.
+    Wire b is a signal input, and wire a is the output of the last gate.
+
+    AND, OR, and shift gates throw away bits, so a long chain of them would
+    soon make wire a the same for every signal on wire b. To keep every
+    bit of wire b flowing through to wire a, a spine of wires runs from b
+    to a, where each step is a reversible function of the previous spine
+    wire: a copy, a NOT, an XOR with a new signal built from OR, AND, and
+    NOT gates, or a rotation built from two shifts and an OR.
+
+    :param size: The number of gates
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    window = 16
+
+    instructions = [f"{rng.randrange(1 << 16)} -> b"]
+    wires = ["b"]
+    spine = "b"
+
+    def add_gate(signal: str) -> str:
+        wire = _wire_name(len(instructions) - 1)
+        instructions.append(f"{signal} -> {wire}")
+        wires.append(wire)
+        return wire
+
+    # The last gate copies the spine to wire a
+    while len(instructions) < size:
+        remaining = size - len(instructions)
+        recent = wires[-window:]
+        if rng.random() < 0.25:
+            step = rng.choices(
+                ["ASSIGN", "NOT", "XOR", "ROTATE"], weights=[1, 1, 2, 2]
+            )[0]
+            if step == "XOR" and remaining >= 5:
+                # A wire that depends on the spine could cancel it out
+                other = add_gate(f"{rng.randrange(1 << 16)}")
+                either = add_gate(f"{spine} OR {other}")
+                both = add_gate(f"{spine} AND {other}")
+                not_both = add_gate(f"NOT {both}")
+                spine = add_gate(f"{either} AND {not_both}")
+            elif step == "ROTATE" and remaining >= 3:
+                shift = rng.randint(1, 15)
+                left = add_gate(f"{spine} LSHIFT {shift}")
+                right = add_gate(f"{spine} RSHIFT {16 - shift}")
+                spine = add_gate(f"{left} OR {right}")
+            elif step == "NOT":
+                spine = add_gate(f"NOT {spine}")
+            else:
+                spine = add_gate(spine)
+            continue
+
+        # New signals are rare, so that most wires depend on wire b
+        operator = rng.choices(
+            ["SIGNAL", "ASSIGN", "NOT", "AND", "OR", "LSHIFT", "RSHIFT"],
+            weights=[1, 2, 4, 8, 8, 4, 4],
+        )[0]
+        match operator:
+            case "SIGNAL":
+                signal = f"{rng.randrange(1 << 16)}"
+            case "ASSIGN":
+                signal = rng.choice(recent)
+            case "NOT":
+                signal = f"NOT {rng.choice(recent)}"
+            case "AND" | "OR":
+                source_1 = rng.choice(recent + ["1"])
+                source_2 = rng.choice(recent)
+                signal = f"{source_1} {operator} {source_2}"
+            case "LSHIFT" | "RSHIFT":
+                signal = (
+                    f"{rng.choice(recent)} {operator} {rng.randint(1, 15)}"
+                )
+        add_gate(signal)
+    instructions.append(f"{spine} -> a")
+
+    # The order of the instructions does not matter
+    rng.shuffle(instructions)
+    for instruction in instructions:
+        yield instruction + "\n"
+
+
+GENERATORS = {
+    1: day_01,
+    2: day_02,
+    3: day_03,
+    4: day_04,
+    5: day_05,
+    6: day_06,
+    7: day_07,
+}
@@ -12,6 +12,12 @@ Part 2
 What is the total similarity between the two columns?
 """
 
+from collections.abc import Iterable
+
+from solution import Result, Stopwatch
+
+STREAMING = True
+
 
 def _part_1(lefts: list[int], rights: list[int]) -> int:
     """
@@ -62,14 +68,18 @@ def _part_2(lefts: list[int], rights: list[int]) -> int:
     return similarity
 
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+def solve(puzzle: Iterable[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2024 Day 1 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     lefts = []
     rights = []
     for line in puzzle:
@@ -79,8 +89,12 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
 
     if part == 1 or part is None:
         distance = _part_1(lefts, rights)
-        print(f"The total distance between the lists is {distance}")
+        message = f"The total distance between the lists is {distance}"
+        results.append(stopwatch.result(1, distance, message))
 
     if part == 2 or part is None:
         similarity = _part_2(lefts, rights)
-        print(f"The total similarity is {similarity}")
+        message = f"The total similarity is {similarity}"
+        results.append(stopwatch.result(2, similarity, message))
+
+    return results
@@ -12,6 +12,12 @@ Part 2
 How many reports are safe if one bad level can be removed?
 """
 
+from collections.abc import Iterable
+
+from solution import Result, Stopwatch
+
+STREAMING = True
+
 
 def _report_is_safe(report: list[int]) -> bool:
     """
@@ -51,14 +57,18 @@ def _report_is_safe(report: list[int]) -> bool:
     return is_safe
 
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+def solve(puzzle: Iterable[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2024 Day 2 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     safe_reports_1 = 0
     safe_reports_2 = 0
     for line in puzzle:
@@ -77,6 +87,10 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
                 safe_reports_2 = safe_reports_2 + 1
 
     if part == 1 or part is None:
-        print(f"The number of safe reports is {safe_reports_1}")
+        message = f"The number of safe reports is {safe_reports_1}"
+        results.append(stopwatch.result(1, safe_reports_1, message))
     if part == 2 or part is None:
-        print(f"The number of safe reports is {safe_reports_2}")
+        message = f"The number of safe reports is {safe_reports_2}"
+        results.append(stopwatch.result(2, safe_reports_2, message))
+
+    return results
@@ -13,32 +13,45 @@ What is the sum of all the valid multiplication instructions
 that are toggled on?
 """
 
+import mmap
 import re
 
+from solution import Result, Stopwatch, as_bytes
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+# The input can be read as raw bytes, e.g. from a memory map
+MAPPABLE = True
+
+# Every instruction, in the order in which they appear
+REGEX = (
+    rb"mul\((?P<a>\d+),(?P<b>\d+)\)|(?P<do>do\(\))|(?P<dont>don't\(\))"
+)
+
+
+def solve(
+    puzzle: list[str] | bytes | mmap.mmap, part: int | None = None
+) -> list[Result]:
     """
     Solve the 2024 Day 3 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, or its raw bytes
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
+    # Instructions never span multiple lines, so the whole input can be
+    # scanned at once, and each do() or don't() applies until the next one
     total_1 = 0
     total_2 = 0
     do_multiply = True
-    for line in puzzle:
-        rmatches = re.finditer(r"mul\((?P<a>\d+),(?P<b>\d+)\)", line)
-        for rmatch in rmatches:
-            start = rmatch.start()
-            check = list(re.finditer(r"(do|don't)\(\)", line[0:start]))
-            if len(check) == 0:
-                pass
-            elif check[-1].group() == "do()":
-                do_multiply = True
-            else:
-                do_multiply = False
-
+    for rmatch in re.finditer(REGEX, as_bytes(puzzle)):
+        if rmatch.group("do") is not None:
+            do_multiply = True
+        elif rmatch.group("dont") is not None:
+            do_multiply = False
+        else:
             a = int(rmatch.group("a"))
             b = int(rmatch.group("b"))
             total_1 = total_1 + a * b
@@ -46,6 +59,10 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
                 total_2 = total_2 + a * b
 
     if part == 1 or part is None:
-        print(f"The total of all multiplications is {total_1}")
+        message = f"The total of all multiplications is {total_1}"
+        results.append(stopwatch.result(1, total_1, message))
     if part == 2 or part is None:
-        print(f"The total of all multiplications is {total_2}")
+        message = f"The total of all multiplications is {total_2}"
+        results.append(stopwatch.result(2, total_2, message))
+
+    return results
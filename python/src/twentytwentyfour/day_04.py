@@ -12,9 +12,10 @@ Part 2
 How many times does "MAS" appear in an "X" shape?
 """
 
-
 from collections.abc import Iterable
 
+from solution import Result, Stopwatch
+
 
 class Find:
     """
@@ -102,14 +103,18 @@ def _get_character_point(find: Find, character: str) -> tuple[int, int]:
     return (row, col)
 
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+def solve(puzzle: list[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2024 Day 4 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     if part == 1 or part is None:
         directions = {
             (-1, -1),
@@ -123,7 +128,8 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
         }
         word = "XMAS"
         finds = _find_words(puzzle, word, directions)
-        print(f"The number of times {word} appears is {len(finds)}")
+        message = f"The number of times {word} appears is {len(finds)}"
+        results.append(stopwatch.result(1, len(finds), message))
 
     if part == 2 or part is None:
         directions = {
@@ -144,4 +150,7 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
                 if cross_point_1 == cross_point_2:
                     count_cross += 1
 
-        print(f"The number of times X-{word} appears is {count_cross}")
+        message = f"The number of times X-{word} appears is {count_cross}"
+        results.append(stopwatch.result(2, count_cross, message))
+
+    return results
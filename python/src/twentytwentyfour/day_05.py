@@ -14,15 +14,21 @@ What is the sum of the middle number of every incorrectly ordered update
 after it has been correctly ordered?
 """
 
+from solution import Result, Stopwatch
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+
+def solve(puzzle: list[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2024 Day 5 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     break_ = puzzle.index("")
     rules = puzzle[0:break_]
     updates = puzzle[break_ + 1:]
@@ -69,13 +75,17 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
             total_2 = total_2 + int(corrected[len(corrected) // 2])
 
     if part == 1 or part is None:
-        print(
+        message = (
             f"The sum of all the middle page numbers "
             f"of correct updates is {total_1}"
         )
+        results.append(stopwatch.result(1, total_1, message))
 
     if part == 2 or part is None:
-        print(
+        message = (
             f"The sum of all the middle page numbers "
             f"of incorrect updates is {total_2}"
         )
+        results.append(stopwatch.result(2, total_2, message))
+
+    return results
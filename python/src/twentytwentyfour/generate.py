@@ -0,0 +1,153 @@
+"""
+Advent of Code 2024 - Input Generators
+
+Each generator produces a valid puzzle input of an arbitrary size for one day,
+so that the solutions can be tested on inputs much larger than the real ones.
+The same size and seed always produce the same input.
+
+Generators yield the input as chunks of text, including the line endings,
+so that very large inputs can be written out without being held in memory.
+"""
+
+import random
+from collections.abc import Iterator
+
+
+def day_01(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2024 Day 1 input
+
+    :param size: The number of rows
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}\n"
+
+
+def day_02(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2024 Day 2 input
+
+    Reports start out safe, and then some have a level made unsafe.
+
+    :param size: The number of reports
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    for _ in range(size):
+        direction = rng.choice([-1, 1])
+        level = rng.randint(20, 80)
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            level = level + direction * rng.randint(1, 3)
+            report.append(level)
+        if rng.random() < 0.5:
+            index = rng.randrange(len(report))
+            report[index] = report[index] + rng.choice([-4, 0, 4])
+        yield " ".join(f"{level}" for level in report) + "\n"
+
+
+def day_03(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2024 Day 3 input
+
+    :param size: The number of instructions, valid or corrupted
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    noise = "!@#$%^&*()[]{}<>,;:'?+- "
+    line_length = 0
+    for index in range(size):
+        a = rng.randint(1, 999)
+        b = rng.randint(1, 999)
+        instruction = rng.choices(
+            [
+                f"mul({a},{b})",
+                f"mul({a}, {b})",
+                f"mul[{a},{b}]",
+                f"mul({a},{b}",
+                "do()",
+                "don't()",
+            ],
+            weights=[10, 1, 1, 1, 1, 1],
+        )[0]
+        filler = "".join(rng.choices(noise, k=rng.randint(0, 6)))
+        yield filler + instruction
+        line_length = line_length + len(filler) + len(instruction)
+        if line_length > 3000 or index == size - 1:
+            yield "\n"
+            line_length = 0
+
+
+def day_04(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2024 Day 4 input
+
+    :param size: The width and height of the word search
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield "".join(rng.choices("XMAS", k=size)) + "\n"
+
+
+def day_05(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2024 Day 5 input
+
+    The pages are split into groups with a rule for every pair of pages
+    within a group, like the real input has for all of its pages,
+    and each update only uses pages from a single group.
+
+    :param size: The number of pages
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    group_size = 24
+    pages = list(range(10, 10 + size))
+    rng.shuffle(pages)
+    groups = [
+        pages[start:start + group_size]
+        for start in range(0, size, group_size)
+    ]
+
+    rules = []
+    for group in groups:
+        for i in range(len(group)):
+            for j in range(i + 1, len(group)):
+                rules.append(f"{group[i]}|{group[j]}")
+    rng.shuffle(rules)
+    for rule in rules:
+        yield rule + "\n"
+    yield "\n"
+
+    for _ in range(max(1, size // 4)):
+        group = rng.choice(groups)
+        length = min(len(group), rng.choice([5, 7, 9, 11, 13, 15]))
+        if length % 2 == 0:
+            length = length - 1
+        update = rng.sample(group, k=length)
+        # Roughly half of the updates are correctly ordered
+        if rng.random() < 0.5:
+            update = sorted(update, key=group.index)
+        yield ",".join(f"{page}" for page in update) + "\n"
+
+
+GENERATORS = {
+    1: day_01,
+    2: day_02,
+    3: day_03,
+    4: day_04,
+    5: day_05,
+}
@@ -16,81 +16,185 @@ and the spelled digits should count as valid digits.
 In both cases, what is the sum of all the calibration values?
 """
 
+from collections.abc import Iterable
+
+from solution import Result, Stopwatch
+
+STREAMING = True
+
+
+DIGITS_1 = {
+    "0": 0,
+    "1": 1,
+    "2": 2,
+    "3": 3,
+    "4": 4,
+    "5": 5,
+    "6": 6,
+    "7": 7,
+    "8": 8,
+    "9": 9,
+}
+DIGITS_2 = DIGITS_1 | {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+}
+
+
+class Automaton:
+    """
+    A class representing an Aho-Corasick automaton, which finds where
+    any of a set of patterns first occurs in a single pass over a string.
+
+    The patterns can come from several dictionaries at once, each mapping
+    patterns to values, and the first match of every dictionary is found
+    in the same pass.
+
+    The failure links are folded into the transitions, so each character
+    costs one dict lookup no matter how many patterns there are.
+    """
 
-def _get_calibration_value(line: str, digits: dict[str, int]) -> int:
+    def __init__(self, dictionaries: list[dict[str, int]]) -> None:
+        num_dictionaries = len(dictionaries)
+        self.num_dictionaries = num_dictionaries
+
+        # Build a trie of the patterns, where each state records the value of
+        # the pattern ending there in each dictionary, if there is one
+        goto = [dict()]
+        outputs = [[None] * num_dictionaries]
+        for index, dictionary in enumerate(dictionaries):
+            for pattern, value in dictionary.items():
+                state = 0
+                for char in pattern:
+                    if char not in goto[state]:
+                        goto[state][char] = len(goto)
+                        goto.append(dict())
+                        outputs.append([None] * num_dictionaries)
+                    state = goto[state][char]
+                outputs[state][index] = value
+
+        # Visit the states in order of depth, so that the state reached from
+        # the longest proper suffix of each state is complete before it
+        transitions = [dict() for _ in goto]
+        suffixes = [0] * len(goto)
+        queue = [0]
+        for state in queue:
+            suffix = suffixes[state]
+            if state != 0:
+                transitions[state] = transitions[suffix].copy()
+                for index, value in enumerate(outputs[suffix]):
+                    # A pattern ending at the suffix also ends here
+                    if outputs[state][index] is None:
+                        outputs[state][index] = value
+            for char, target in goto[state].items():
+                transitions[state][char] = target
+                if state != 0:
+                    suffixes[target] = transitions[suffix].get(char, 0)
+                queue.append(target)
+
+        self.transitions = transitions
+        # Only states where some pattern ends have outputs
+        self.outputs = [
+            None if output.count(None) == num_dictionaries else tuple(output)
+            for output in outputs
+        ]
+
+    def first_matches(self, chars: Iterable[str]) -> list[int | None]:
+        """
+        Find the value of the pattern that is first to end in a string,
+        for each dictionary.
+
+        This is also the first pattern to start in the string,
+        as long as no pattern lies strictly within another pattern.
+
+        :param chars: The characters of the string to search
+        :returns:
+            A list of the value of the first match for each dictionary,
+            or None where no pattern of the dictionary is found
+        """
+
+        transitions = self.transitions
+        outputs = self.outputs
+        matches = [None] * self.num_dictionaries
+        num_remaining = self.num_dictionaries
+        state = 0
+        for char in chars:
+            state = transitions[state].get(char, 0)
+            output = outputs[state]
+            if output is None:
+                continue
+            for index, value in enumerate(output):
+                if value is not None and matches[index] is None:
+                    matches[index] = value
+                    num_remaining = num_remaining - 1
+            if num_remaining == 0:
+                break
+
+        return matches
+
+
+# The last match in a line is the first match of its reverse
+# in the reversed line
+FORWARD = Automaton([DIGITS_1, DIGITS_2])
+BACKWARD = Automaton(
+    [
+        {pattern[::-1]: value for pattern, value in digits.items()}
+        for digits in (DIGITS_1, DIGITS_2)
+    ]
+)
+
+
+def _get_calibration_values(line: str) -> list[int]:
     """
-    Find the calibration value of the input line,
-    which consists of the first and last digits in the line.
+    Find the calibration values of the input line,
+    which consist of the first and last digits in the line,
+    for both the decimal digits and the decimal or spelled digits.
 
     :param line: The string to search
-    :param digits:
-        A dict mapping a string definition of a digit to an integer value
+    :returns:
+        A list of the calibration values for DIGITS_1 and DIGITS_2,
+        which are 0 if no digits are found
     """
 
-    index_first = len(line)
-    index_last = 0
-    digit_first = "0"
-    digit_last = "0"
-    for digit in digits:
-        if digit not in line:
-            continue
-        index = line.find(digit)
-        if index <= index_first:
-            index_first = index
-            digit_first = digit
-        index = line.rfind(digit)
-        if index >= index_last:
-            index_last = index
-            digit_last = digit
-
-    return 10 * digits[digit_first] + digits[digit_last]
-
-
-def solve(puzzle: list[str], part: int | None = None) -> None:
+    firsts = FORWARD.first_matches(line)
+    lasts = BACKWARD.first_matches(reversed(line))
+    return [
+        10 * (first or 0) + (last or 0) for first, last in zip(firsts, lasts)
+    ]
+
+
+def solve(puzzle: Iterable[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2023 Day 1 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
-    DIGITS_1 = {
-        "0": 0,
-        "1": 1,
-        "2": 2,
-        "3": 3,
-        "4": 4,
-        "5": 5,
-        "6": 6,
-        "7": 7,
-        "8": 8,
-        "9": 9,
-    }
-    DIGITS_2 = DIGITS_1.copy()
-    DIGITS_2.update(
-        {
-            "one": 1,
-            "two": 2,
-            "three": 3,
-            "four": 4,
-            "five": 5,
-            "six": 6,
-            "seven": 7,
-            "eight": 8,
-            "nine": 9,
-        }
-    )
+    stopwatch = Stopwatch()
+    results = []
 
+    # Both parts are solved in one pass over each line in each direction
     total_1 = 0
     total_2 = 0
     for line in puzzle:
-        if part == 1 or part is None:
-            total_1 = total_1 + _get_calibration_value(line, digits=DIGITS_1)
-
-        if part == 2 or part is None:
-            total_2 = total_2 + _get_calibration_value(line, digits=DIGITS_2)
+        value_1, value_2 = _get_calibration_values(line)
+        total_1 = total_1 + value_1
+        total_2 = total_2 + value_2
 
     if part == 1 or part is None:
-        print(f"The sum of the calibration values is {total_1}.")
+        message = f"The sum of the calibration values is {total_1}."
+        results.append(stopwatch.result(1, total_1, message))
     if part == 2 or part is None:
-        print(f"The sum of the calibration values is now {total_2}.")
+        message = f"The sum of the calibration values is now {total_2}."
+        results.append(stopwatch.result(2, total_2, message))
+
+    return results
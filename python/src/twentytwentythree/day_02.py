@@ -22,15 +22,25 @@ to generate a power value.
 What is the sum of the all the power values of the minimum sets?
 """
 
+from collections.abc import Iterable
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+from solution import Result, Stopwatch
+
+STREAMING = True
+
+
+def solve(puzzle: Iterable[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2023 Day 2 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     # Used in Part 1
     COLOR_DISTRIBUTION = {"red": 12, "green": 13, "blue": 14}
     sum_id = 0
@@ -71,8 +81,12 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
         sum_power = sum_power + power
 
     if part == 1 or part is None:
-        print(f"The sum of the possible game IDs is {sum_id}.")
+        message = f"The sum of the possible game IDs is {sum_id}."
+        results.append(stopwatch.result(1, sum_id, message))
     if part == 2 or part is None:
-        print(
+        message = (
             f"The sum of the power values of the minumum sets is {sum_power}."
         )
+        results.append(stopwatch.result(2, sum_power, message))
+
+    return results
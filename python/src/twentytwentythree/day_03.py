@@ -18,162 +18,242 @@ Part 2
 What is the sum of all the gear ratios?
 """
 
+import itertools
+import re
+from collections.abc import Iterable, Iterator
 
-def _find_gear_ratios(
-    puzzle: list[str], index_row: int, part_numbers: list[dict]
-) -> list[int]:
+from solution import Result, Stopwatch, chunks, parallel_map
+
+STREAMING = True
+
+# Large inputs can be split across worker processes
+PARALLEL = True
+
+# The number of rows in each band handed to a worker process
+BAND_ROWS = 1 << 12
+
+NUMBER = re.compile(r"[0-9]+")
+# Anything but a digit or a period is a symbol
+SYMBOL = re.compile(r"[^0-9.]")
+
+
+class Row:
+    """
+    A class representing the numbers and symbols found in one row
+    of the schematic
+    """
+
+    def __init__(self, row: str) -> None:
+        # The (stop column, value) of each number, keyed by its start column
+        self.numbers = dict()
+        # The start column of the number covering each column with a digit
+        self.starts = dict()
+        for number in NUMBER.finditer(row):
+            start = number.start()
+            self.numbers[start] = (number.end(), int(number.group()))
+            for index_col in range(start, number.end()):
+                self.starts[index_col] = start
+
+        self.symbols = set()
+        self.stars = []
+        for symbol in SYMBOL.finditer(row):
+            self.symbols.add(symbol.start())
+            if symbol.group() == "*":
+                self.stars.append(symbol.start())
+
+
+def _scan_row(above: Row, row: Row, below: Row) -> tuple[int, int]:
+    """
+    Find the part numbers and gears of one row, which only depend on
+    the rows directly above and below it
+
+    :param above: The row above, which is empty for the first row
+    :param row: The row to scan
+    :param below: The row below, which is empty for the last row
+    :returns:
+        A tuple of the sum of the part numbers and the sum of the gear ratios
+        within the row
+    """
+
+    window = (above, row, below)
+
+    sum_part_numbers = 0
+    for start, (stop, value) in row.numbers.items():
+        if any(
+            index_col in neighbor.symbols
+            for neighbor in window
+            for index_col in range(start - 1, stop + 1)
+        ):
+            sum_part_numbers = sum_part_numbers + value
+
+    sum_gear_ratios = 0
+    for index_col in row.stars:
+        # Numbers are identified by their row within the window
+        # and their start column
+        neighbors = set()
+        for index_row, neighbor in enumerate(window):
+            for j in range(index_col - 1, index_col + 2):
+                start = neighbor.starts.get(j)
+                if start is not None:
+                    neighbors.add((index_row, start))
+        if len(neighbors) == 2:
+            (row_1, start_1), (row_2, start_2) = neighbors
+            sum_gear_ratios = (
+                sum_gear_ratios
+                + window[row_1].numbers[start_1][1]
+                * window[row_2].numbers[start_2][1]
+            )
+
+    return sum_part_numbers, sum_gear_ratios
+
+
+def _scan(
+    rows: Iterable[str],
+    context_above: bool = False,
+    context_below: bool = False,
+) -> tuple[int, int]:
+    """
+    Find the part numbers and gears of a band of rows, sliding a window of
+    three rows down the band, so that only three rows are ever held at once.
+
+    :param rows: The rows of the band
+    :param context_above:
+        If True, the first row is only used as the neighbor of the second,
+        as it belongs to the band above
+    :param context_below:
+        If True, the last row is only used as the neighbor of the one before,
+        as it belongs to the band below
+    :returns:
+        A tuple of the sum of the part numbers and the sum of the gear ratios
+        within the band
+    """
+
+    sum_part_numbers = 0
+    sum_gear_ratios = 0
+
+    rows = map(Row, rows)
+    empty = Row("")
+    above = empty
+    row = next(rows, None)
+    if row is not None and context_above:
+        above = row
+        row = next(rows, None)
+    while row is not None:
+        below = next(rows, None)
+        if below is None and context_below:
+            break
+        part_numbers, gear_ratios = _scan_row(
+            above, row, empty if below is None else below
+        )
+        sum_part_numbers = sum_part_numbers + part_numbers
+        sum_gear_ratios = sum_gear_ratios + gear_ratios
+        above = row
+        row = below
+
+    return sum_part_numbers, sum_gear_ratios
+
+
+def _scan_band(band: tuple[list[str], bool, bool]) -> tuple[int, int]:
+    """
+    Find the part numbers and gears of a band of rows
+
+    :param band: The arguments to _scan()
+    :returns:
+        A tuple of the sum of the part numbers and the sum of the gear ratios
+        within the band
+    """
+
+    return _scan(*band)
+
+
+def _bands(puzzle: Iterable[str]) -> Iterator[tuple[list[str], bool, bool]]:
     """
-    Generate the list of all gear ratios within the input window given the
-    input part numbers
-
-    :param window: The input region to search for part numbers
-    :param index_window: The index of the window basis row
-    :param part_numbers:
-        The list of dicts containing part number values and positions
-    :returns: The list of gear ratios found within the window
+    Split the schematic into bands of rows, where each band also includes
+    the rows directly above and below it, so that every band can be scanned
+    on its own. Every row belongs to exactly one band, so nothing is
+    counted twice when the results of the bands are added together.
+
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
+    :returns:
+        An iterator over the rows of each band, with whether the first and
+        last rows belong to the neighboring bands
     """
 
-    gear_ratios = list()
-    row = puzzle[index_row]
-
-    num_rows = len(puzzle)
-    num_cols = len(row)
-    for index_col, char in enumerate(row):
-        if char == "*":
-            neighboring_part_numbers = list()
-            for part_number in part_numbers:
-                part_found = False
-                for i in range(-1, 2):
-                    if index_row + i < 0 or index_row + i >= num_rows:
-                        continue
-                    for j in range(-1, 2):
-                        if index_col + j < 0 or index_col + j >= num_cols:
-                            continue
-
-                        if (
-                            not part_found
-                            and part_number["row"] == index_row + i
-                            and index_col + j in part_number["columns"]
-                        ):
-                            part_found = True
-                            neighboring_part_numbers.append(part_number)
-
-            if len(neighboring_part_numbers) == 2:
-                gear_ratios.append(
-                    neighboring_part_numbers[0]["value"]
-                    * neighboring_part_numbers[1]["value"]
-                )
-
-    return gear_ratios
-
-
-def _find_part_numbers(puzzle: list[str], index_row: int) -> list[dict]:
+    bands = chunks(puzzle, BAND_ROWS)
+    previous = None
+    band = next(bands, None)
+    while band is not None:
+        following = next(bands, None)
+        rows = band
+        if previous is not None:
+            rows = [previous[-1]] + rows
+        if following is not None:
+            rows = rows + [following[0]]
+        yield rows, previous is not None, following is not None
+        previous = band
+        band = following
+
+
+def _scan_all(
+    puzzle: Iterable[str], workers: int = 1
+) -> tuple[int, int]:
     """
-    Generate the list of all part numbers within the input window
+    Find the part numbers and gears of the whole schematic.
 
-    :param puzzle: The input puzzle
-    :param index_row: The row to search for part numbers
+    Schematics of more than one band can be scanned by worker processes,
+    otherwise every row is streamed through this process.
+
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
+    :param workers: The number of worker processes to use for large inputs
     :returns:
-        A list of dictionaries, where each entry represents a part number.
-        Example:
-        {
-            "value": 123,  # The part number
-            "row": 1,  # The row index
-            "columns": [1,2,3]  # The column indices within the row
-        }
+        A tuple of the sum of the part numbers and the sum of the gear ratios
     """
 
-    part_numbers = list()
-    row = puzzle[index_row]
-
-    num_rows = len(puzzle)
-    num_cols = len(row)
-
-    # Part 1: Used to build part numbers
-    add_part_number = False
-    part_number = ""
-    # Part 2: Used to track part number locations as we go
-    columns = list()
-    for index_col, char in enumerate(row):
-        # If we find a digit, we want to consider it for a part number
-        if char.isdigit():
-            # Part 1: We just need the number
-            part_number = part_number + char
-            # Part 2: We also need the location
-            columns.append(index_col)
-            for i in range(-1, 2):
-                if index_row + i < 0 or index_row + i >= num_rows:
-                    continue
-                for j in range(-1, 2):
-                    if index_col + j < 0 or index_col + j >= num_cols:
-                        continue
-                    neighbor = puzzle[index_row + i][index_col + j]
-                    # A number is a part number if it has a neighbor
-                    # that is not a digit and not a period
-                    if not neighbor.isdigit() and neighbor != ".":
-                        add_part_number = True
-
-            # Handle cases where the row ends in a number
-            if index_col == num_cols - 1 and add_part_number:
-                # Part 1: "number" is needed
-                # Part 2: "row" and "columns" are needed
-                part_numbers.append(
-                    {
-                        "value": int(part_number),
-                        "row": index_row,
-                        "columns": columns,
-                    }
-                )
-
-                add_part_number = False
-                columns = list()
-                part_number = ""
-
-        # The character is not a digit, so we need to reset our part number
-        else:
-            if add_part_number:
-                # Part 1: "number" is needed
-                # Part 2: "row" and "columns" are needed
-                part_numbers.append(
-                    {
-                        "value": int(part_number),
-                        "row": index_row,
-                        "columns": columns,
-                    }
-                )
-            add_part_number = False
-            columns = list()
-            part_number = ""
-
-    return part_numbers
-
-
-def solve(puzzle: list[str], part: int | None = None) -> None:
+    if workers == 1:
+        return _scan(puzzle)
+
+    bands = _bands(puzzle)
+    first = next(bands, None)
+    if first is None:
+        return 0, 0
+    bands = itertools.chain([first], bands)
+    # The first band only has a row below it if there is more than one band
+    if not first[2]:
+        totals = map(_scan_band, bands)
+    else:
+        totals = parallel_map(_scan_band, bands, workers)
+
+    sum_part_numbers = 0
+    sum_gear_ratios = 0
+    for band_part_numbers, band_gear_ratios in totals:
+        sum_part_numbers = sum_part_numbers + band_part_numbers
+        sum_gear_ratios = sum_gear_ratios + band_gear_ratios
+
+    return sum_part_numbers, sum_gear_ratios
+
+
+def solve(
+    puzzle: Iterable[str], part: int | None = None, workers: int = 1
+) -> list[Result]:
     """
     Solve the 2023 Day 3 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :param workers: the number of worker processes to use for large inputs
+    :returns: the answers to the solved parts of the puzzle
     """
 
-    # Part 1
-    part_numbers = []
-    # Part 2
-    gear_ratios = []
-    for index_row, row in enumerate(puzzle):
-        part_numbers.extend(_find_part_numbers(puzzle, index_row))
-        gear_ratios.extend(
-            _find_gear_ratios(puzzle, index_row - 1, part_numbers)
-        )
+    stopwatch = Stopwatch()
+    results = []
 
-    # Handle the last line for gear ratios
-    gear_ratios.extend(_find_gear_ratios(puzzle, index_row, part_numbers))
+    sum_part_numbers, sum_gear_ratios = _scan_all(puzzle, workers)
 
     if part == 1 or part is None:
-        sum_part_numbers = sum(
-            part_number["value"] for part_number in part_numbers
-        )
-        print(f"The sum of the part numbers is {sum_part_numbers}.")
+        message = f"The sum of the part numbers is {sum_part_numbers}."
+        results.append(stopwatch.result(1, sum_part_numbers, message))
     if part == 2 or part is None:
-        sum_gear_ratios = sum(gear_ratio for gear_ratio in gear_ratios)
-        print(f"The sum of the gear ratios is {sum_gear_ratios}.")
+        message = f"The sum of the gear ratios is {sum_gear_ratios}."
+        results.append(stopwatch.result(2, sum_gear_ratios, message))
+
+    return results
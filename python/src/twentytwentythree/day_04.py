@@ -20,18 +20,30 @@ Each of those copied cards can subsequently generate additional copies.
 What is the total number of cards?
 """
 
+from collections.abc import Iterable
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+from solution import Result, Stopwatch
+
+STREAMING = True
+
+
+def solve(puzzle: Iterable[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2023 Day 4 puzzle.
 
-    :param puzzle: the contents of the puzzle file
+    :param puzzle: the lines of the puzzle file, as a list or an iterator
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     # Part 1
     total_score = 0
     # Part 2
+    total_cards = 0
+    # Only the cards that have been won but not yet reached are kept
     scratchcards = dict()
     for card in puzzle:
         components = card.split(":")
@@ -70,11 +82,14 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
                 )
             else:
                 scratchcards[copy_id] = scratchcards[card_id]
+        total_cards = total_cards + scratchcards.pop(card_id)
 
     if part == 1 or part is None:
-        print(f"The total score of the cards is {total_score}.")
+        message = f"The total score of the cards is {total_score}."
+        results.append(stopwatch.result(1, total_score, message))
     if part == 2 or part is None:
-        print(
-            f"The total number cards is "
-            f"{sum(value for value in scratchcards.values())}."
-        )
+        total_cards = total_cards + sum(scratchcards.values())
+        message = f"The total number cards is {total_cards}."
+        results.append(stopwatch.result(2, total_cards, message))
+
+    return results
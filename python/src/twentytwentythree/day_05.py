@@ -20,62 +20,141 @@ In both parts, what is the lowest location number
 that corresponds to any of the initial seed numbers?
 """
 
+import bisect
 
-def _get_destination(maps: dict, source: int, reverse=False) -> int:
+from solution import Result, Stopwatch
+
+# The maps, in the order they are applied from seed to location
+MAP_ORDER = [
+    "seed-to-soil",
+    "soil-to-fertilizer",
+    "fertilizer-to-water",
+    "water-to-light",
+    "light-to-temperature",
+    "temperature-to-humidity",
+    "humidity-to-location",
+]
+
+
+class AlmanacMap:
     """
-    Trace the source value to its final destination.
-
-    :param maps:
-        A dict containing all the mapping information for each type of map
-    :param source: The starting value of the first map to check
-    :param reverse:
-        If true, work backwards through the maps,
-        e.g. location to seed instead of seed to location.
-    :returns: The final destination value for the input source
+    A class representing one map of the almanac, e.g. seed-to-soil.
+
+    The mini maps are sorted by source and kept as parallel lists of where
+    each starts and stops, and the offset it adds, so the mini map holding
+    a value is found by bisection rather than by checking each in turn.
+    Values outside every mini map keep their values.
     """
 
-    ordered_maps = [
-        "seed-to-soil",
-        "soil-to-fertilizer",
-        "fertilizer-to-water",
-        "water-to-light",
-        "light-to-temperature",
-        "temperature-to-humidity",
-        "humidity-to-location",
-    ]
-
-    if reverse:
-        ordered_maps = reversed(ordered_maps)
-        source_key = "destination"
-        destination_key = "source"
-    else:
-        source_key = "source"
-        destination_key = "destination"
-    for map_ in ordered_maps:
-        for mini_map in maps[map_]:
-            if (
-                source >= mini_map[source_key]
-                and source <= mini_map[source_key] + mini_map["range"]
-            ):
-                source = (
-                    mini_map[destination_key] + source - mini_map[source_key]
+    def __init__(self, mini_maps: list[tuple[int, int, int]]) -> None:
+        """
+        :param mini_maps: The (destination, source, range) of each mini map
+        """
+
+        self.starts = []
+        self.stops = []
+        self.offsets = []
+        for destination, source, range_ in sorted(
+            mini_maps, key=lambda mini_map: mini_map[1]
+        ):
+            if self.stops and source < self.stops[-1]:
+                raise ValueError(
+                    f"The mini map starting at source {source} overlaps "
+                    f"the mini map before it."
                 )
-                break
+            self.starts.append(source)
+            self.stops.append(source + range_)
+            self.offsets.append(destination - source)
+
+    def get_destination(self, source: int) -> int:
+        """
+        Map a source to its destination
+
+        :param source: The value to map
+        :returns: The destination of the value
+        """
+
+        index = bisect.bisect_right(self.starts, source) - 1
+        # Each mini map covers its source up to, but not including,
+        # its source plus its range
+        if index >= 0 and source < self.stops[index]:
+            return source + self.offsets[index]
+        return source
+
+    def map_ranges(
+        self, ranges: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        """
+        Map whole ranges of sources to their destinations.
+
+        Each range is split wherever it crosses the edge of a mini map,
+        and each piece is shifted by the offset of the mini map it falls in.
+
+        :param ranges:
+            The (start, stop) ranges of sources, where stop is excluded
+        :returns:
+            The (start, stop) ranges of destinations, where stop is excluded
+        """
+
+        destinations = []
+        for start, stop in ranges:
+            # Start from the last mini map starting at or before the range
+            first = max(bisect.bisect_right(self.starts, start) - 1, 0)
+            for index in range(first, len(self.starts)):
+                source_start = self.starts[index]
+                source_stop = self.stops[index]
+                if source_stop <= start:
+                    continue
+                if source_start >= stop:
+                    break
+
+                # The part of the range before the mini map is left as is
+                if start < source_start:
+                    destinations.append((start, source_start))
+                    start = source_start
+                end = min(stop, source_stop)
+                offset = self.offsets[index]
+                destinations.append((start + offset, end + offset))
+                start = end
+                if start >= stop:
+                    break
+
+            if start < stop:
+                destinations.append((start, stop))
+
+        return destinations
+
+
+def _get_location(maps: list[AlmanacMap], seed: int) -> int:
+    """
+    Trace a seed through every map to its location
+
+    :param maps: The maps of the almanac, in order from seed to location
+    :param seed: The seed to trace
+    :returns: The location of the seed
+    """
 
-    return source
+    value = seed
+    for map_ in maps:
+        value = map_.get_destination(value)
+    return value
 
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+def solve(puzzle: list[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2023 Day 5 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     # Pull in the input data
     map_ = ""
-    maps = dict()
+    mini_maps = dict()
     seeds = list()
     for line in puzzle:
         # skip blank lines
@@ -87,7 +166,7 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
             # We've encountered a new map region, so we add it to our maps
             if "map" in line:
                 map_ = line.split()[0]
-                maps[map_] = list()
+                mini_maps[map_] = list()
             else:
                 components = line.split()
                 if len(components) != 3:
@@ -96,42 +175,36 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
                         f"a destination, a source, and a range.\n"
                         f"Found: {components}"
                     )
-                maps[map_].append(
-                    {
-                        "destination": int(components[0]),
-                        "source": int(components[1]),
-                        "range": int(components[2]),
-                    }
+                mini_maps[map_].append(
+                    tuple(int(component) for component in components)
                 )
+    maps = [AlmanacMap(mini_maps[map_]) for map_ in MAP_ORDER]
 
     # Part 1: The seed values are as provided
     if part == 1 or part is None:
-        location = None
-        for seed in seeds:
-            result = _get_destination(maps, seed)
-            if location is None or location > result:
-                location = result
-        print(f"The smallest location value is {location}.")
+        location = min(
+            (_get_location(maps, seed) for seed in seeds), default=None
+        )
+        message = f"The smallest location value is {location}."
+        results.append(stopwatch.result(1, location, message))
 
     # Part 2: The seeds values actually describe ranges,
-    # so have to do some extra looping.
-    # It is a bit faster to just iterate through the locations and then stop
-    # when we find the first one, rather than check all seed numbers.
+    # so the whole ranges are mapped at once, splitting them as they cross
+    # the edges of the mini maps, rather than mapping each seed
     if part == 2 or part is None:
         if len(seeds) % 2 != 0:
             raise ValueError(
                 f"The number of seed values must be even, "
                 f"but found {len(seeds)}"
             )
-        location = 0
-        seed_found = False
-        while not seed_found:
-            check_seed = _get_destination(maps, location, reverse=True)
-            for i in range(0, len(seeds), 2):
-                seed = seeds[i]
-                offset = seeds[i + 1]
-                if check_seed >= seed and check_seed <= seed + offset:
-                    seed_found = True
-            if not seed_found:
-                location = location + 1
-        print(f"The smallest location value is {location}.")
+        ranges = [
+            (seeds[i], seeds[i] + seeds[i + 1])
+            for i in range(0, len(seeds), 2)
+        ]
+        for map_ in maps:
+            ranges = map_.map_ranges(ranges)
+        location = min(start for start, stop in ranges if start < stop)
+        message = f"The smallest location value is {location}."
+        results.append(stopwatch.result(2, location, message))
+
+    return results
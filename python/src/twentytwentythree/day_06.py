@@ -18,31 +18,72 @@ There is actually only one race.
 What is the number of ways to beat this race?
 """
 
+import itertools
+import math
+from collections.abc import Iterable
+
+from solution import Result, Stopwatch
+
 
 def _calculate_ways_to_win(time: int, distance: int) -> int:
     """
-    Calculate the number of ways to win a race
+    Calculate the number of ways to win a race.
+
+    Holding the button for t of the time travels t * (time - t),
+    so the winning hold times lie strictly between the roots of
+    t**2 - time * t + distance = 0. The first winning hold time is found
+    from the integer square root of the discriminant, and the winning hold
+    times are symmetric about time / 2, so no hold times are tried
+    one by one and any size of race takes constant time.
 
     :param time: The time in which the race must be completed
     :param distance: The distance which must be travelled to win
+    :returns: The number of whole hold times, from 0 to time - 1, that win
     """
 
-    ways_to_win = 0
-    for t in range(time):
-        if t * (time - t) > distance:
-            ways_to_win = ways_to_win + 1
+    # Every hold time travels at least 0
+    if distance < 0:
+        return time
+
+    discriminant = time * time - 4 * distance
+    if discriminant <= 0:
+        return 0
 
-    return ways_to_win
+    # The rounding of isqrt leaves this at most one below the first winner
+    hold = (time - math.isqrt(discriminant)) // 2
+    while hold * (time - hold) <= distance:
+        hold = hold + 1
+        if 2 * hold > time:
+            return 0
 
+    return time - 2 * hold + 1
 
-def solve(puzzle: list[str], part: int | None = None) -> None:
+
+def _calculate_ways_to_win_batch(
+    races: Iterable[tuple[int, int]],
+) -> list[int]:
+    """
+    Calculate the number of ways to win each of many races
+
+    :param races: The (time, distance) of each race
+    :returns: The number of ways to win each race, in order
+    """
+
+    return list(itertools.starmap(_calculate_ways_to_win, races))
+
+
+def solve(puzzle: list[str], part: int | None = None) -> list[Result]:
     """
     Solve the 2023 Day 6 puzzle.
 
     :param puzzle: the contents of the puzzle file
     :param part: the part of the puzzle to solve. If None, solve both parts.
+    :returns: the answers to the solved parts of the puzzle
     """
 
+    stopwatch = Stopwatch()
+    results = []
+
     info_1 = dict()
     info_2 = dict()
     for line in puzzle:
@@ -58,21 +99,23 @@ def solve(puzzle: list[str], part: int | None = None) -> None:
         if len(set(len(values) for values in info_1.values())) != 1:
             raise ValueError("Found mismatched race values")
 
-        num_ways_to_win = list()
-        for time, distance in zip(info_1["Time"], info_1["Distance"]):
-            num_ways_to_win.append(_calculate_ways_to_win(time, distance))
+        num_ways_to_win = _calculate_ways_to_win_batch(
+            zip(info_1["Time"], info_1["Distance"])
+        )
 
         product = 1
         for ways_to_win in num_ways_to_win:
             product = product * ways_to_win
-        print(
+        message = (
             f"The product of the number of ways to win each race is {product}"
         )
+        results.append(stopwatch.result(1, product, message))
 
     if part == 2 or part is None:
         time = info_2["Time"]
         distance = info_2["Distance"]
-        print(
-            f"The number of ways to win the bigger race is "
-            f"{_calculate_ways_to_win(time, distance)}"
-        )
+        ways_to_win = _calculate_ways_to_win(time, distance)
+        message = f"The number of ways to win the bigger race is {ways_to_win}"
+        results.append(stopwatch.result(2, ways_to_win, message))
+
+    return results
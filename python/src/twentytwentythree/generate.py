@@ -0,0 +1,236 @@
+"""
+Advent of Code 2023 - Input Generators
+
+Each generator produces a valid puzzle input of an arbitrary size for one day,
+so that the solutions can be tested on inputs much larger than the real ones.
+The same size and seed always produce the same input.
+
+Generators yield the input as chunks of text, including the line endings,
+so that very large inputs can be written out without being held in memory.
+"""
+
+import random
+import string
+from collections.abc import Iterator
+
+DIGIT_WORDS = [
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+]
+
+
+def day_01(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2023 Day 1 input
+
+    Every line contains at least one decimal digit.
+
+    :param size: The number of lines
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    for _ in range(size):
+        pieces = [rng.choice(string.digits[1:])]
+        for _ in range(rng.randint(2, 8)):
+            choice = rng.random()
+            if choice < 0.2:
+                pieces.append(rng.choice(string.digits[1:]))
+            elif choice < 0.5:
+                pieces.append(rng.choice(DIGIT_WORDS))
+            else:
+                length = rng.randint(1, 4)
+                pieces.append(
+                    "".join(rng.choices(string.ascii_lowercase, k=length))
+                )
+        rng.shuffle(pieces)
+        yield "".join(pieces) + "\n"
+
+
+def day_02(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2023 Day 2 input
+
+    :param size: The number of games
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    colors = ["red", "green", "blue"]
+    for game_id in range(1, size + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            drawn = rng.sample(colors, k=rng.randint(1, 3))
+            draws.append(
+                ", ".join(f"{rng.randint(1, 20)} {color}" for color in drawn)
+            )
+        yield f"Game {game_id}: {'; '.join(draws)}\n"
+
+
+def day_03(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2023 Day 3 input
+
+    :param size: The width and height of the engine schematic
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    symbols = "*#+$/=%@&-"
+    for _ in range(size):
+        row = []
+        length = 0
+        while length < size:
+            choice = rng.random()
+            if choice < 0.1:
+                # Keep numbers separated by at least one period
+                digits = min(rng.randint(1, 3), size - length)
+                piece = f"{rng.randint(10 ** (digits - 1), 10**digits - 1)}"
+                if length + digits < size:
+                    piece = piece + "."
+            elif choice < 0.16:
+                piece = rng.choice(symbols)
+            else:
+                piece = "."
+            row.append(piece)
+            length = length + len(piece)
+        yield "".join(row) + "\n"
+
+
+def day_04(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2023 Day 4 input
+
+    Most cards have no winning numbers, so that the number of copies
+    in part 2 stays bounded no matter how many cards there are,
+    and no card wins copies of cards past the end of the table.
+
+    :param size: The number of cards
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    width = len(f"{size}")
+    for card_id in range(1, size + 1):
+        if rng.random() < 0.7:
+            num_matches = 0
+        else:
+            num_matches = min(rng.randint(1, 4), size - card_id)
+        numbers = rng.sample(range(1, 100), k=35 - num_matches)
+        winning = numbers[:10]
+        found = winning[:num_matches] + numbers[10:]
+        rng.shuffle(found)
+        yield (
+            f"Card {card_id:>{width}}: "
+            f"{' '.join(f'{number:>2}' for number in winning)} | "
+            f"{' '.join(f'{number:>2}' for number in found)}\n"
+        )
+
+
+def day_05(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2023 Day 5 input
+
+    Each map is a random permutation of contiguous blocks of the
+    numbers from 0 to 2**32 - 1.
+
+    :param size: The number of entries in each map
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    rng = random.Random(seed)
+    space = 1 << 32
+
+    seeds = []
+    for _ in range(10):
+        start = rng.randrange(space // 2)
+        seeds.extend([start, rng.randrange(1, space // 20)])
+    yield f"seeds: {' '.join(f'{seed}' for seed in seeds)}\n"
+
+    maps = [
+        "seed-to-soil",
+        "soil-to-fertilizer",
+        "fertilizer-to-water",
+        "water-to-light",
+        "light-to-temperature",
+        "temperature-to-humidity",
+        "humidity-to-location",
+    ]
+    for map_ in maps:
+        yield f"\n{map_} map:\n"
+        cuts = sorted(rng.sample(range(1, space), k=size - 1))
+        bounds = [0] + cuts + [space]
+        sources = [
+            (start, stop - start) for start, stop in zip(bounds, bounds[1:])
+        ]
+        rng.shuffle(sources)
+
+        destination = 0
+        for source, range_ in sources:
+            yield f"{destination} {source} {range_}\n"
+            destination = destination + range_
+
+
+# Keeps the joined race of 2023 Day 6 part 2 under 4300 digits
+MAX_RACES = 1000
+
+
+def day_06(size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generate a 2023 Day 6 input
+
+    Every record distance can be beaten.
+
+    Part 2 joins every distance into a single number, and Python refuses to
+    convert strings of more than 4300 digits to integers by default.
+    Every distance has at most four digits, so at most 1000 races can be
+    made.
+
+    :param size: The number of races, from 1 to 1000
+    :param seed: The seed for the random number generator
+    :returns: An iterator over the lines of the input
+    """
+
+    if not 1 <= size <= MAX_RACES:
+        raise ValueError(
+            f"The number of races must be from 1 to {MAX_RACES}, not {size}."
+        )
+
+    rng = random.Random(seed)
+    times = []
+    distances = []
+    for _ in range(size):
+        time = rng.randint(10, 99)
+        hold = rng.randint(1, time // 2 - 1)
+        times.append(time)
+        distances.append(hold * (time - hold))
+
+    width = len(f"{max(distances)}") + 1
+    yield "Time:    " + "".join(f"{time:>{width}}" for time in times) + "\n"
+    yield (
+        "Distance:"
+        + "".join(f"{distance:>{width}}" for distance in distances)
+        + "\n"
+    )
+
+
+GENERATORS = {
+    1: day_01,
+    2: day_02,
+    3: day_03,
+    4: day_04,
+    5: day_05,
+    6: day_06,
+}